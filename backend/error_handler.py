@@ -145,15 +145,17 @@ class CircuitBreaker:
         self.failure_threshold = failure_threshold
         self.timeout = timeout
         self.failure_count = 0
-        self.last_failure_time = None
+        self.open_until = 0.0  # 熔断截止时刻（monotonic时钟），开启时预计算
         self.state = 'CLOSED'  # CLOSED, OPEN, HALF_OPEN
         self.logger = logging.getLogger(__name__)
-    
+
     def call(self, func: Callable, *args, **kwargs) -> Any:
         """调用函数，应用熔断逻辑"""
         if self.state == 'OPEN':
-            if time.time() - self.last_failure_time < self.timeout:
-                raise Exception(f"熔断器开启，服务不可用，剩余时间: {self.timeout - (time.time() - self.last_failure_time):.1f}秒")
+            # monotonic时钟不受系统时间调整影响，单次读取即可判断
+            now = time.monotonic()
+            if now < self.open_until:
+                raise Exception(f"熔断器开启，服务不可用，剩余时间: {self.open_until - now:.1f}秒")
             else:
                 self.state = 'HALF_OPEN'
                 self.logger.info("熔断器进入半开状态")
@@ -176,10 +178,10 @@ class CircuitBreaker:
     def on_failure(self):
         """失败时的处理"""
         self.failure_count += 1
-        self.last_failure_time = time.time()
-        
+
         if self.failure_count >= self.failure_threshold:
             self.state = 'OPEN'
+            self.open_until = time.monotonic() + self.timeout
             self.logger.warning(f"熔断器开启，失败次数: {self.failure_count}")
 
 
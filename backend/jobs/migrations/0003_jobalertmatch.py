@@ -0,0 +1,26 @@
+# Generated by Django 5.2.17 on 2026-08-31 20:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobAlertMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('alert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matches', to='jobs.jobalert')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alert_matches', to='jobs.job')),
+            ],
+            options={
+                'unique_together': {('alert', 'job')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.17 on 2026-08-31 20:37
+
+from django.db import migrations, models
+
+
+def populate_full_path(apps, schema_editor):
+    JobCategory = apps.get_model('jobs', 'JobCategory')
+    categories = {c.pk: c for c in JobCategory.objects.all()}
+
+    def build_path(category):
+        if category.parent_id:
+            return f"{build_path(categories[category.parent_id])} > {category.name}"
+        return category.name
+
+    for category in categories.values():
+        category.full_path = build_path(category)
+    JobCategory.objects.bulk_update(categories.values(), ['full_path'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_jobalertmatch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobcategory',
+            name='full_path',
+            field=models.CharField(blank=True, editable=False, max_length=500),
+        ),
+        migrations.RunPython(populate_full_path, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# 职位关键词全文检索的GIN索引（仅PostgreSQL）
+#
+# 表达式与views._apply_keyword_filter里的SearchVector保持一致，
+# SQLite等其他后端跳过（查询侧同样回退到icontains）。
+
+from django.db import migrations
+
+SEARCH_VECTOR_SQL = (
+    "to_tsvector('english', COALESCE(title, '') || ' ' || "
+    "COALESCE(description, '') || ' ' || COALESCE(requirements, ''))"
+)
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS jobs_job_search_gin "
+        f"ON jobs_job USING GIN ({SEARCH_VECTOR_SQL})"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS jobs_job_search_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_jobcategory_full_path'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
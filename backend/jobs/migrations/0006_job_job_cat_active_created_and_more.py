@@ -0,0 +1,22 @@
+# Generated by Django 5.2.17 on 2026-08-31 21:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_job_search_gin_index'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['category', 'is_active', '-created_at'], name='job_cat_active_created'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['job_type', 'is_active', '-created_at'], name='job_type_active_created'),
+        ),
+    ]
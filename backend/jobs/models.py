@@ -1,6 +1,6 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
-from users.models import EmployerProfile, Skill
+from users.models import EmployerProfile, Skill, User
 
 
 class Job(models.Model):
@@ -74,6 +74,11 @@ class Job(models.Model):
             models.Index(fields=['is_active', '-created_at']),
             models.Index(fields=['job_type', 'experience_level']),
             models.Index(fields=['location_city']),
+            # 列表页热路径：等值过滤+按创建时间倒序，复合索引避免每次排序
+            models.Index(fields=['category', 'is_active', '-created_at'],
+                         name='job_cat_active_created'),
+            models.Index(fields=['job_type', 'is_active', '-created_at'],
+                         name='job_type_active_created'),
         ]
 
     def __str__(self):
@@ -144,9 +149,11 @@ class JobCategory(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True)
     parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='subcategories')
+    # 物化路径列，保存时维护，避免每次渲染递归查询父级
+    full_path = models.CharField(max_length=500, blank=True, editable=False)
     is_active = models.BooleanField(default=True)
     sort_order = models.IntegerField(default=0)
-    
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -158,18 +165,19 @@ class JobCategory(models.Model):
             return f"{self.parent.name} > {self.name}"
         return self.name
 
-    @property
-    def full_path(self):
-        """获取完整分类路径"""
-        if self.parent:
-            return f"{self.parent.full_path} > {self.name}"
-        return self.name
+    def save(self, *args, **kwargs):
+        if self.parent_id:
+            self.full_path = f"{self.parent.full_path} > {self.name}"
+        else:
+            self.full_path = self.name
+        super().save(*args, **kwargs)
+        # 名称或父级变化时同步子分类路径
+        for child in self.subcategories.all():
+            child.save()
 
 
 class JobAlert(models.Model):
     """职位提醒模型"""
-    from users.models import User
-    
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='job_alerts')
     name = models.CharField(max_length=200)
     
@@ -202,5 +210,18 @@ class JobAlert(models.Model):
         return f"{self.user.username} - {self.name}"
 
 
+class JobAlertMatch(models.Model):
+    """职位提醒匹配记录模型"""
+    alert = models.ForeignKey(JobAlert, on_delete=models.CASCADE, related_name='matches')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='alert_matches')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['alert', 'job']
+
+    def __str__(self):
+        return f"{self.alert.name} - {self.job.title}"
+
+
 # 将Job模型与JobCategory关联
 Job.add_to_class('category', models.ForeignKey(JobCategory, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs'))
@@ -3,9 +3,27 @@
 """
 
 from rest_framework import serializers
+from django.core.cache import cache
+from django.db.models import Count, F
 from django.utils import timezone
 from .models import Job, JobSkillRequirement, JobSkillPreference, JobCategory, JobAlert
-from users.models import Skill, EmployerProfile
+from users.models import Skill, EmployerProfile, StudentProfile
+from applications.models import Application
+
+# 活跃技能ID集合的短TTL缓存，技能表变化低频，60秒内的脏读可接受
+ACTIVE_SKILL_IDS_CACHE_KEY = 'jobs:active_skill_ids'
+ACTIVE_SKILL_IDS_CACHE_TTL = 60
+
+
+def get_active_skill_ids():
+    """获取活跃技能ID集合（带短TTL缓存）"""
+    skill_ids = cache.get(ACTIVE_SKILL_IDS_CACHE_KEY)
+    if skill_ids is None:
+        skill_ids = set(
+            Skill.objects.filter(is_active=True).values_list('id', flat=True)
+        )
+        cache.set(ACTIVE_SKILL_IDS_CACHE_KEY, skill_ids, ACTIVE_SKILL_IDS_CACHE_TTL)
+    return skill_ids
 
 
 class JobCategorySerializer(serializers.ModelSerializer):
@@ -13,130 +31,212 @@ class JobCategorySerializer(serializers.ModelSerializer):
     
     class Meta:
         model = JobCategory
-        fields = ['id', 'name', 'description', 'is_active']
-        read_only_fields = ['id']
+        fields = ('id', 'name', 'description', 'is_active')
+        read_only_fields = ('id',)
+
+
+def _get_batch_valid_skill_ids(root):
+    """从根序列化器的原始数据中一次性查出有效技能ID集合
+
+    嵌套的技能序列化器逐行验证skill_id时共享这份集合，
+    整个请求只需一条SELECT。独立使用（非嵌套）时返回None，
+    由调用方回退到单条查询。
+    """
+    initial = getattr(root, 'initial_data', None)
+    if not isinstance(initial, dict):
+        return None
+    if 'required_skills' not in initial and 'preferred_skills' not in initial:
+        return None
+
+    cached = getattr(root, '_valid_skill_ids', None)
+    if cached is None:
+        requested = set()
+        for key in ('required_skills', 'preferred_skills'):
+            for item in initial.get(key) or []:
+                if isinstance(item, dict) and 'skill_id' in item:
+                    try:
+                        requested.add(int(item['skill_id']))
+                    except (TypeError, ValueError):
+                        continue
+        cached = requested & get_active_skill_ids()
+        root._valid_skill_ids = cached
+    return cached
 
 
 class JobSkillRequirementSerializer(serializers.ModelSerializer):
     """职位技能要求序列化器"""
-    skill = serializers.StringRelatedField(read_only=True)
+    # 直接读skill.name，避免StringRelatedField对skill对象的__str__格式化开销
+    skill = serializers.CharField(source='skill.name', read_only=True)
     skill_id = serializers.IntegerField(write_only=True)
     skill_name = serializers.CharField(source='skill.name', read_only=True)
     
     class Meta:
         model = JobSkillRequirement
-        fields = [
+        fields = (
             'id', 'skill', 'skill_id', 'skill_name',
             'importance', 'min_experience_years', 'weight'
-        ]
-        read_only_fields = ['id']
-    
+        )
+        read_only_fields = ('id',)
+
     def validate_skill_id(self, value):
-        """验证技能ID"""
-        try:
-            Skill.objects.get(id=value, is_active=True)
-        except Skill.DoesNotExist:
-            raise serializers.ValidationError("技能不存在或已停用")
+        """验证技能ID（嵌套使用时按整批预取）"""
+        valid_ids = _get_batch_valid_skill_ids(self.root)
+        if valid_ids is not None:
+            if value not in valid_ids:
+                raise serializers.ValidationError("技能不存在或已停用")
+            return value
+        if value not in get_active_skill_ids():
+            # 缓存窗口内新增的技能不在集合里，用走主键索引的exists()确认后再拒绝
+            if not Skill.objects.filter(id=value, is_active=True).exists():
+                raise serializers.ValidationError("技能不存在或已停用")
         return value
 
 
 class JobSkillPreferenceSerializer(serializers.ModelSerializer):
     """职位技能偏好序列化器"""
-    skill = serializers.StringRelatedField(read_only=True)
+    skill = serializers.CharField(source='skill.name', read_only=True)
     skill_id = serializers.IntegerField(write_only=True)
     skill_name = serializers.CharField(source='skill.name', read_only=True)
     
     class Meta:
         model = JobSkillPreference
-        fields = [
+        fields = (
             'id', 'skill', 'skill_id', 'skill_name', 'bonus_points'
-        ]
-        read_only_fields = ['id']
-    
+        )
+        read_only_fields = ('id',)
+
     def validate_skill_id(self, value):
-        """验证技能ID"""
-        try:
-            Skill.objects.get(id=value, is_active=True)
-        except Skill.DoesNotExist:
-            raise serializers.ValidationError("技能不存在或已停用")
+        """验证技能ID（嵌套使用时按整批预取）"""
+        valid_ids = _get_batch_valid_skill_ids(self.root)
+        if valid_ids is not None:
+            if value not in valid_ids:
+                raise serializers.ValidationError("技能不存在或已停用")
+            return value
+        if value not in get_active_skill_ids():
+            # 缓存窗口内新增的技能不在集合里，用走主键索引的exists()确认后再拒绝
+            if not Skill.objects.filter(id=value, is_active=True).exists():
+                raise serializers.ValidationError("技能不存在或已停用")
         return value
 
 
-class JobListSerializer(serializers.ModelSerializer):
-    """职位列表序列化器（简化版）"""
-    employer_name = serializers.CharField(source='employer.company_name', read_only=True)
-    category_name = serializers.CharField(source='category.name', read_only=True)
-    required_skills_count = serializers.SerializerMethodField()
-    applications_count = serializers.SerializerMethodField()
-    
+class EmployerBriefSerializer(serializers.ModelSerializer):
+    """雇主简要信息序列化器（职位详情内嵌）"""
+    website_url = serializers.URLField(source='website', read_only=True)
+
     class Meta:
-        model = Job
-        fields = [
-            'id', 'title', 'employer_name', 'category_name',
-            'job_type', 'experience_level', 'location_city',
-            'remote_option', 'salary_min', 'salary_max',
-            'application_deadline', 'is_active', 'created_at',
-            'required_skills_count', 'applications_count'
-        ]
-        read_only_fields = ['id', 'created_at']
-    
-    def get_required_skills_count(self, obj):
-        """获取必需技能数量"""
-        return obj.jobskillrequirement_set.count()
-    
-    def get_applications_count(self, obj):
-        """获取申请数量"""
-        return obj.applications.count()
+        model = EmployerProfile
+        fields = (
+            'id', 'company_name', 'industry', 'company_size',
+            'website_url', 'is_verified'
+        )
+        read_only_fields = fields
+
+
+# 列表序列化所需的values()列，关联名称通过注解拉平成普通列
+JOB_LIST_VALUES_FIELDS = (
+    'id', 'title', 'employer_name', 'category_name',
+    'job_type', 'experience_level', 'location_city',
+    'remote_option', 'salary_min', 'salary_max',
+    'application_deadline', 'is_active', 'created_at',
+    'num_required_skills', 'num_applications',
+)
+
+
+def job_list_values(queryset):
+    """把职位查询集收敛为列表序列化所需的字典流
+
+    values()跳过模型实例化，只从数据库取列表真正用到的列。
+    """
+    return queryset.annotate(
+        employer_name=F('employer__company_name'),
+        category_name=F('category__name'),
+    ).values(*JOB_LIST_VALUES_FIELDS)
+
+
+class JobListSerializer(serializers.Serializer):
+    """职位列表序列化器（简化版，直接消费values()字典）"""
+    id = serializers.IntegerField(read_only=True)
+    title = serializers.CharField(read_only=True)
+    employer_name = serializers.CharField(read_only=True)
+    category_name = serializers.CharField(read_only=True, allow_null=True)
+    job_type = serializers.CharField(read_only=True)
+    experience_level = serializers.CharField(read_only=True)
+    location_city = serializers.CharField(read_only=True)
+    remote_option = serializers.CharField(read_only=True)
+    salary_min = serializers.DecimalField(
+        max_digits=10, decimal_places=2, read_only=True, allow_null=True
+    )
+    salary_max = serializers.DecimalField(
+        max_digits=10, decimal_places=2, read_only=True, allow_null=True
+    )
+    application_deadline = serializers.DateTimeField(read_only=True, allow_null=True)
+    is_active = serializers.BooleanField(read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
+    required_skills_count = serializers.IntegerField(
+        source='num_required_skills', read_only=True, default=0
+    )
+    applications_count = serializers.IntegerField(
+        source='num_applications', read_only=True, default=0
+    )
 
 
 class JobDetailSerializer(serializers.ModelSerializer):
     """职位详情序列化器"""
     employer_name = serializers.CharField(source='employer.company_name', read_only=True)
-    employer_info = serializers.SerializerMethodField()
+    employer_info = EmployerBriefSerializer(source='employer', read_only=True)
     category_name = serializers.CharField(source='category.name', read_only=True)
     required_skills = JobSkillRequirementSerializer(source='jobskillrequirement_set', many=True, read_only=True)
     preferred_skills = JobSkillPreferenceSerializer(source='jobskillpreference_set', many=True, read_only=True)
-    applications_count = serializers.SerializerMethodField()
+    applications_count = serializers.IntegerField(
+        source='num_applications', read_only=True, default=0
+    )
     is_applied = serializers.SerializerMethodField()
-    
+
+    # 详情输出实际读取的列，与Meta.fields保持同步，避免拉取无关TEXT字段
+    ONLY_FIELDS = (
+        'id', 'title', 'description', 'requirements',
+        'job_type', 'experience_level',
+        'location_city', 'location_state', 'location_country',
+        'remote_option', 'salary_min', 'salary_max', 'benefits',
+        'application_deadline', 'is_active', 'is_featured',
+        'created_at', 'updated_at', 'category',
+        'employer__id', 'employer__company_name', 'employer__industry',
+        'employer__company_size', 'employer__website', 'employer__is_verified',
+        'category__id', 'category__name',
+    )
+
     class Meta:
         model = Job
-        fields = [
+        fields = (
             'id', 'title', 'description', 'requirements',
             'employer_name', 'employer_info', 'category', 'category_name',
             'job_type', 'experience_level', 'location_city', 'location_state', 'location_country',
             'remote_option', 'salary_min', 'salary_max', 'benefits',
             'application_deadline', 'is_active', 'is_featured', 'created_at', 'updated_at',
             'required_skills', 'preferred_skills', 'applications_count', 'is_applied'
-        ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
-    
-    def get_employer_info(self, obj):
-        """获取雇主基本信息"""
-        return {
-            'id': obj.employer.id,
-            'company_name': obj.employer.company_name,
-            'industry': obj.employer.industry,
-            'company_size': obj.employer.company_size,
-            'website_url': obj.employer.website_url,
-            'is_verified': obj.employer.is_verified
-        }
-    
-    def get_applications_count(self, obj):
-        """获取申请数量"""
-        return obj.application_set.count()
+        )
+        read_only_fields = ('id', 'created_at', 'updated_at')
     
     def get_is_applied(self, obj):
-        """检查当前用户是否已申请"""
+        """检查当前用户是否已申请（结果按请求记忆，整次请求只查一次）"""
         request = self.context.get('request')
-        if request and request.user.is_authenticated and request.user.user_type == 'student':
+        if not (request and request.user.is_authenticated and request.user.user_type == 'student'):
+            return False
+
+        applied_job_ids = getattr(request, '_applied_job_ids', None)
+        if applied_job_ids is None:
             try:
-                from users.models import StudentProfile
                 student_profile = StudentProfile.objects.get(user=request.user)
-                return obj.application_set.filter(student=student_profile).exists()
+                applied_job_ids = set(
+                    Application.objects.filter(
+                        student=student_profile
+                    ).values_list('job_id', flat=True)
+                )
             except StudentProfile.DoesNotExist:
-                pass
-        return False
+                applied_job_ids = set()
+            request._applied_job_ids = applied_job_ids
+
+        return obj.id in applied_job_ids
 
 
 class JobCreateUpdateSerializer(serializers.ModelSerializer):
@@ -146,36 +246,19 @@ class JobCreateUpdateSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Job
-        fields = [
+        fields = (
             'title', 'description', 'requirements', 'category',
             'job_type', 'experience_level', 'location_city', 'location_state', 'location_country',
             'remote_option', 'salary_min', 'salary_max', 'benefits',
             'application_deadline', 'is_featured', 'required_skills', 'preferred_skills'
-        ]
+        )
     
     def validate_application_deadline(self, value):
-        """验证申请截止日期"""
-        from datetime import date
-        
-        # 如果value是datetime对象，转换为date
-        if hasattr(value, 'date'):
-            value = value.date()
-        
-        # 如果value是字符串，尝试解析为date
-        if isinstance(value, str):
-            try:
-                from datetime import datetime
-                value = datetime.strptime(value, '%Y-%m-%d').date()
-            except ValueError:
-                raise serializers.ValidationError("日期格式必须是YYYY-MM-DD")
-        
-        # 确保value是date对象
-        if not isinstance(value, date):
-            raise serializers.ValidationError("无效的日期格式")
-        
-        # 比较日期
-        today = timezone.now().date()
-        if value <= today:
+        """验证申请截止日期
+
+        DRF的DateTimeField已经完成字符串解析，这里只需比较日期。
+        """
+        if value.date() <= timezone.localdate():
             raise serializers.ValidationError("申请截止日期必须是未来的日期")
         return value
     
@@ -231,24 +314,20 @@ class JobCreateUpdateSerializer(serializers.ModelSerializer):
         return instance
     
     def _create_skill_requirements(self, job, skills_data):
-        """创建技能要求"""
-        for skill_data in skills_data:
-            skill_id = skill_data.pop('skill_id')
-            JobSkillRequirement.objects.create(
-                job=job,
-                skill_id=skill_id,
-                **skill_data
-            )
-    
+        """批量创建技能要求"""
+        requirements = [
+            JobSkillRequirement(job=job, **skill_data)
+            for skill_data in skills_data
+        ]
+        JobSkillRequirement.objects.bulk_create(requirements, batch_size=100)
+
     def _create_skill_preferences(self, job, skills_data):
-        """创建技能偏好"""
-        for skill_data in skills_data:
-            skill_id = skill_data.pop('skill_id')
-            JobSkillPreference.objects.create(
-                job=job,
-                skill_id=skill_id,
-                **skill_data
-            )
+        """批量创建技能偏好"""
+        preferences = [
+            JobSkillPreference(job=job, **skill_data)
+            for skill_data in skills_data
+        ]
+        JobSkillPreference.objects.bulk_create(preferences, batch_size=100)
 
 
 class JobAlertSerializer(serializers.ModelSerializer):
@@ -256,12 +335,12 @@ class JobAlertSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = JobAlert
-        fields = [
+        fields = (
             'id', 'keywords', 'location', 'job_type',
             'salary_min', 'experience_level', 'is_active',
             'created_at', 'updated_at'
-        ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        )
+        read_only_fields = ('id', 'created_at', 'updated_at')
     
     def create(self, validated_data):
         """创建职位提醒"""
@@ -271,14 +350,20 @@ class JobAlertSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+# 预先物化为不可变元组，序列化器实例化时不再复制模型的choices列表
+JOB_TYPE_CHOICES = tuple(Job.JOB_TYPES)
+EXPERIENCE_LEVEL_CHOICES = tuple(Job.EXPERIENCE_LEVELS)
+REMOTE_OPTION_CHOICES = tuple(Job.REMOTE_OPTIONS)
+
+
 class JobSearchSerializer(serializers.Serializer):
     """职位搜索序列化器"""
     keywords = serializers.CharField(required=False, allow_blank=True)
     category = serializers.IntegerField(required=False)
-    job_type = serializers.ChoiceField(choices=Job.JOB_TYPES, required=False)
-    experience_level = serializers.ChoiceField(choices=Job.EXPERIENCE_LEVELS, required=False)
+    job_type = serializers.ChoiceField(choices=JOB_TYPE_CHOICES, required=False)
+    experience_level = serializers.ChoiceField(choices=EXPERIENCE_LEVEL_CHOICES, required=False)
     location = serializers.CharField(required=False, allow_blank=True)
-    remote_option = serializers.ChoiceField(choices=Job.REMOTE_OPTIONS, required=False)
+    remote_option = serializers.ChoiceField(choices=REMOTE_OPTION_CHOICES, required=False)
     salary_min = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
     salary_max = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
     skills = serializers.ListField(
@@ -291,8 +376,9 @@ class JobSearchSerializer(serializers.Serializer):
         """验证搜索参数"""
         salary_min = data.get('salary_min')
         salary_max = data.get('salary_max')
-        
-        if salary_min and salary_max and salary_min > salary_max:
+
+        # 用is not None判断，薪资为0时同样参与区间校验
+        if salary_min is not None and salary_max is not None and salary_min > salary_max:
             raise serializers.ValidationError("最低薪资不能高于最高薪资")
-        
+
         return data
\ No newline at end of file
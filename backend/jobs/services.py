@@ -0,0 +1,253 @@
+"""
+职位提醒服务模块
+负责扫描职位并批量分发职位提醒
+"""
+
+from typing import List, Optional
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db.models import Count, Q
+from django.utils import timezone
+from celery import shared_task
+import logging
+import numpy as np
+
+from .models import Job, JobAlert, JobAlertMatch, JobSkillRequirement
+
+logger = logging.getLogger(__name__)
+
+# 批量写入大小，控制单条SQL的参数数量
+ALERT_SCAN_CHUNK_SIZE = 500
+MATCH_BULK_BATCH_SIZE = 1000
+ALERT_UPDATE_BATCH_SIZE = 500
+
+# 异步解析结果的缓存键模板与保留时长
+PARSE_RESULT_CACHE_KEY = 'jobs:parse-result:%s'
+PARSE_RESULT_TTL = 3600
+
+# 城市分布前10的"物化"缓存：城市分布变化以小时计，
+# 不值得每次统计请求都全表聚合。TTL略长于刷新周期，
+# 由Celery beat的定时刷新保持常热
+LOCATION_STATS_CACHE_KEY = 'jobs:location-top10'
+LOCATION_STATS_TTL = 3900
+LOCATION_STATS_LIMIT = 10
+
+
+def refresh_location_stats() -> dict:
+    """重算活跃职位的城市分布前10并写入缓存"""
+    rows = Job.objects.filter(is_active=True).values('location_city').annotate(
+        count=Count('id')
+    ).order_by('-count')[:LOCATION_STATS_LIMIT]
+
+    counts = {row['location_city']: row['count'] for row in rows}
+    cache.set(LOCATION_STATS_CACHE_KEY, counts, LOCATION_STATS_TTL)
+    return counts
+
+
+def get_location_stats() -> dict:
+    """读取城市分布前10，缓存未命中时同步重算一次"""
+    counts = cache.get(LOCATION_STATS_CACHE_KEY)
+    if counts is None:
+        counts = refresh_location_stats()
+    return counts
+
+
+def extract_job_text(file_obj, file_extension: str) -> str:
+    """从职位描述文件对象中提取纯文本
+
+    解析失败时异常原样抛出，由调用方决定如何上报。
+    """
+    # 用join一次拼接，避免逐段 += 造成的O(N²)字符串重分配
+    if file_extension == 'pdf':
+        import PyPDF2
+
+        pdf_reader = PyPDF2.PdfReader(file_obj)
+        return "\n".join(page.extract_text() for page in pdf_reader.pages)
+
+    if file_extension in ('doc', 'docx'):
+        import docx
+
+        doc = docx.Document(file_obj)
+        return "\n".join(paragraph.text for paragraph in doc.paragraphs)
+
+    if file_extension == 'txt':
+        data = file_obj.read()
+        try:
+            return data.decode('utf-8')
+        except UnicodeDecodeError:
+            return data.decode('gbk')
+
+    return ""
+
+
+def _build_job_filter(alert: JobAlert) -> Q:
+    """根据提醒的搜索条件构建职位过滤器"""
+    conditions = Q(is_active=True)
+
+    if alert.keywords:
+        keyword_q = Q()
+        for keyword in alert.keywords.split():
+            keyword_q |= Q(title__icontains=keyword)
+        conditions &= keyword_q
+
+    if alert.job_types:
+        conditions &= Q(job_type__in=alert.job_types)
+
+    if alert.experience_levels:
+        conditions &= Q(experience_level__in=alert.experience_levels)
+
+    if alert.locations:
+        conditions &= Q(location_city__in=alert.locations)
+
+    if alert.remote_options:
+        conditions &= Q(remote_option__in=alert.remote_options)
+
+    if alert.salary_min is not None:
+        conditions &= Q(salary_min__gte=alert.salary_min)
+
+    return conditions
+
+
+def dispatch_job_alerts(frequency: str = 'daily') -> dict:
+    """扫描活跃提醒并批量记录匹配的新职位
+
+    使用iterator()流式扫描提醒，避免一次性加载全部记录；
+    匹配结果通过bulk_create批量写入，last_sent通过bulk_update
+    批量更新，将N次UPDATE合并为N/batch_size次。
+    """
+    now = timezone.now()
+    total_matches = 0
+    touched_alerts: List[JobAlert] = []
+
+    alerts = JobAlert.objects.filter(
+        is_active=True,
+        frequency=frequency
+    ).iterator(chunk_size=ALERT_SCAN_CHUNK_SIZE)
+
+    for alert in alerts:
+        # 只取匹配和通知所需的列，避免传输description等TEXT大字段
+        new_jobs = Job.objects.filter(
+            _build_job_filter(alert)
+        ).only(
+            'id', 'title', 'job_type', 'location_city',
+            'experience_level', 'salary_min'
+        )
+
+        if alert.last_sent:
+            new_jobs = new_jobs.filter(created_at__gt=alert.last_sent)
+
+        matches = [
+            JobAlertMatch(alert=alert, job=job)
+            for job in new_jobs.iterator(chunk_size=ALERT_SCAN_CHUNK_SIZE)
+        ]
+
+        if matches:
+            JobAlertMatch.objects.bulk_create(
+                matches,
+                batch_size=MATCH_BULK_BATCH_SIZE,
+                ignore_conflicts=True
+            )
+            total_matches += len(matches)
+
+        alert.last_sent = now
+        touched_alerts.append(alert)
+
+        # 分批刷新last_sent，避免积累过大的更新列表
+        if len(touched_alerts) >= ALERT_UPDATE_BATCH_SIZE:
+            JobAlert.objects.bulk_update(
+                touched_alerts, ['last_sent'],
+                batch_size=ALERT_UPDATE_BATCH_SIZE
+            )
+            touched_alerts = []
+
+    if touched_alerts:
+        JobAlert.objects.bulk_update(
+            touched_alerts, ['last_sent'],
+            batch_size=ALERT_UPDATE_BATCH_SIZE
+        )
+
+    logger.info(f"职位提醒扫描完成: frequency={frequency}, 新匹配 {total_matches} 条")
+    return {'frequency': frequency, 'total_matches': total_matches}
+
+
+def rank_jobs_by_relevance(rows: List[dict], salary_min=None, salary_max=None,
+                           skill_ids: Optional[List[int]] = None) -> List[dict]:
+    """按相关度对职位行排序（NumPy向量化打分）
+
+    得分由薪资匹配度和技能重合率组成，整批职位在数组层面
+    一次算完，避免逐行Python循环。rows为job_list_values()
+    产出的字典列表。
+    """
+    if not rows:
+        return rows
+
+    n = len(rows)
+    scores = np.zeros(n)
+
+    # 薪资匹配度：期望区间与职位区间的重合程度
+    if salary_min is not None or salary_max is not None:
+        job_min = np.array([float(r['salary_min'] or 0.0) for r in rows])
+        job_max = np.array([float(r['salary_max'] or r['salary_min'] or 0.0) for r in rows])
+        want_min = float(salary_min) if salary_min is not None else 0.0
+        want_max = float(salary_max) if salary_max is not None else np.inf
+
+        overlap = np.minimum(job_max, want_max) - np.maximum(job_min, want_min)
+        span = np.maximum(job_max - job_min, 1.0)
+        scores += np.clip(overlap / span, 0.0, 1.0)
+
+    # 技能重合率：命中的必需技能数 / 请求的技能数，一条查询算全批
+    if skill_ids:
+        matched_counts = {}
+        matched = JobSkillRequirement.objects.filter(
+            job_id__in=[r['id'] for r in rows],
+            skill_id__in=skill_ids
+        ).values_list('job_id', flat=True)
+        for job_id in matched:
+            matched_counts[job_id] = matched_counts.get(job_id, 0) + 1
+
+        hits = np.array([matched_counts.get(r['id'], 0) for r in rows], dtype=np.float64)
+        scores += hits / len(skill_ids)
+
+    order = np.argsort(-scores, kind='stable')
+    return [rows[i] for i in order]
+
+
+@shared_task
+def dispatch_job_alerts_task(frequency: str = 'daily'):
+    """职位提醒分发的异步任务"""
+    return dispatch_job_alerts(frequency)
+
+
+@shared_task
+def refresh_location_stats_task():
+    """城市分布统计的定时刷新任务（配到Celery beat每小时一次）"""
+    return refresh_location_stats()
+
+
+@shared_task
+def parse_job_description_task(task_id: str, storage_path: str, file_extension: str):
+    """职位描述文件的异步解析任务
+
+    文本提取和AI调用都在worker里完成，结果写入缓存，
+    由parse/<task_id>/接口轮询读取。
+    """
+    from matching.google_ai_service import GoogleAIService
+    from .views import _parse_job_ai_response
+
+    cache_key = PARSE_RESULT_CACHE_KEY % task_id
+    try:
+        with default_storage.open(storage_path) as file_obj:
+            text_content = extract_job_text(file_obj, file_extension)
+
+        ai_response = GoogleAIService().parse_job_description(text_content)
+        parsed_data = _parse_job_ai_response(ai_response)
+        cache.set(cache_key, {'status': 'done', 'result': parsed_data},
+                  PARSE_RESULT_TTL)
+        logger.info(f"AI解析职位描述成功: task_id={task_id}")
+    except Exception as e:
+        logger.error(f"AI解析职位描述失败: task_id={task_id}, {str(e)}")
+        cache.set(cache_key, {'status': 'failed', 'error': str(e)},
+                  PARSE_RESULT_TTL)
+    finally:
+        default_storage.delete(storage_path)
+    return task_id
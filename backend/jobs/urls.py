@@ -14,6 +14,7 @@ urlpatterns = [
     path('my/', views.my_jobs, name='my-jobs'),
     path('<int:job_id>/apply/', views.apply_job, name='apply-job'),
     path('parse/', views.parse_job_description, name='parse-job-description'),
+    path('parse/<str:task_id>/', views.parse_job_description_status, name='parse-job-description-status'),
     path('demo-create/', views.demo_create_job, name='demo-create-job'),
     
     # 职位分类
@@ -3,7 +3,11 @@
 """
 
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Count, Avg
+from django.core.cache import cache
+from django.db import connection
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q, Count, Avg, Exists, OuterRef, prefetch_related_objects
+from django.http import HttpResponse, JsonResponse
 from django.utils import timezone
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
@@ -13,17 +17,80 @@ from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 import json
 import logging
+import re
+from datetime import datetime
+from uuid import uuid4
 
-from .models import Job, JobCategory, JobAlert
+from .models import Job, JobCategory, JobAlert, JobSkillRequirement
 from .serializers import (
     JobListSerializer, JobDetailSerializer, JobCreateUpdateSerializer,
-    JobCategorySerializer, JobAlertSerializer, JobSearchSerializer
+    JobCategorySerializer, JobAlertSerializer, JobSearchSerializer,
+    job_list_values
 )
-from users.models import EmployerProfile, StudentProfile
+from .services import (
+    rank_jobs_by_relevance, parse_job_description_task, get_location_stats,
+    PARSE_RESULT_CACHE_KEY, PARSE_RESULT_TTL
+)
+from users.models import EmployerProfile
 from applications.models import Application
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# 高频只读端点的缓存键与TTL，读多写少的数据用短TTL换掉绝大部分查询
+STATISTICS_CACHE_KEY = 'jobs:statistics'
+STATISTICS_CACHE_TTL = 300
+FEATURED_JOBS_CACHE_KEY = 'jobs:featured'
+RECENT_JOBS_CACHE_KEY = 'jobs:recent'
+HOME_LIST_CACHE_TTL = 60
+
+# 列表接口允许的排序字段
+_ALLOWED_ORDERING = frozenset({
+    'created_at', '-created_at', 'salary_min', '-salary_min',
+    'application_deadline',
+})
+
+
+def _apply_keyword_filter(queryset, keywords):
+    """关键词过滤
+
+    PostgreSQL走全文检索，命中迁移0005创建的GIN索引；
+    其他后端（开发用SQLite）回退到icontains模糊匹配。
+    """
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchVector
+        vector = SearchVector('title', 'description', 'requirements', config='english')
+        return queryset.annotate(search=vector).filter(
+            search=SearchQuery(keywords, config='english')
+        )
+    return queryset.filter(
+        Q(title__icontains=keywords) |
+        Q(description__icontains=keywords) |
+        Q(requirements__icontains=keywords)
+    )
+
+
+def _finalize_list_row(row):
+    """把内部注解键改名为对外的计数字段名"""
+    row['required_skills_count'] = row.pop('num_required_skills', 0)
+    row['applications_count'] = row.pop('num_applications', 0)
+    return row
+
+
+def _json_list_response(payload):
+    """直接序列化列表负载，优先走orjson的C实现"""
+    if orjson is not None:
+        return HttpResponse(
+            orjson.dumps(payload, default=str),
+            content_type='application/json'
+        )
+    return JsonResponse(payload, encoder=DjangoJSONEncoder, safe=False)
+
 
 class JobPagination(PageNumberPagination):
     """职位分页器"""
@@ -43,99 +110,158 @@ class JobListCreateView(generics.ListCreateAPIView):
     
     def get_queryset(self):
         """获取职位查询集"""
-        queryset = Job.objects.filter(is_active=True).select_related(
-            'employer', 'category'
-        ).prefetch_related('jobskillrequirement_set__skill')
+        # 用注解一次性算出列表所需的计数，避免序列化器逐行COUNT
+        queryset = Job.objects.filter(is_active=True).annotate(
+            num_required_skills=Count('jobskillrequirement', distinct=True),
+            num_applications=Count('applications', distinct=True)
+        )
         
-        # 搜索过滤
-        search_serializer = JobSearchSerializer(data=self.request.query_params)
-        if search_serializer.is_valid():
-            data = search_serializer.validated_data
-            
-            # 关键词搜索
-            keywords = data.get('keywords')
-            if keywords:
-                queryset = queryset.filter(
-                    Q(title__icontains=keywords) |
-                    Q(description__icontains=keywords) |
-                    Q(requirements__icontains=keywords)
-                )
+        # 搜索过滤；无查询参数的裸列表请求直接跳过serializer校验
+        search_data = {}
+        if self.request.query_params:
+            search_serializer = JobSearchSerializer(data=self.request.query_params)
+            if search_serializer.is_valid():
+                data = search_serializer.validated_data
+                search_data = data
+
+                # 关键词搜索
+                keywords = data.get('keywords')
+                if keywords:
+                    queryset = _apply_keyword_filter(queryset, keywords)
             
-            # 分类过滤
-            category = data.get('category')
-            if category:
-                queryset = queryset.filter(category_id=category)
+                # 分类过滤
+                category = data.get('category')
+                if category:
+                    queryset = queryset.filter(category_id=category)
             
-            # 职位类型过滤
-            job_type = data.get('job_type')
-            if job_type:
-                queryset = queryset.filter(job_type=job_type)
+                # 职位类型过滤
+                job_type = data.get('job_type')
+                if job_type:
+                    queryset = queryset.filter(job_type=job_type)
             
-            # 经验要求过滤
-            experience_level = data.get('experience_level')
-            if experience_level:
-                queryset = queryset.filter(experience_level=experience_level)
+                # 经验要求过滤
+                experience_level = data.get('experience_level')
+                if experience_level:
+                    queryset = queryset.filter(experience_level=experience_level)
             
-            # 地点过滤
-            location = data.get('location')
-            if location:
-                queryset = queryset.filter(location_city__icontains=location)
+                # 地点过滤
+                location = data.get('location')
+                if location:
+                    queryset = queryset.filter(location_city__icontains=location)
             
-            # 远程工作过滤
-            remote_option = data.get('remote_option')
-            if remote_option:
-                queryset = queryset.filter(remote_option=remote_option)
+                # 远程工作过滤
+                remote_option = data.get('remote_option')
+                if remote_option:
+                    queryset = queryset.filter(remote_option=remote_option)
             
-            # 薪资范围过滤
-            salary_min = data.get('salary_min')
-            salary_max = data.get('salary_max')
-            if salary_min:
-                queryset = queryset.filter(salary_max__gte=salary_min)
-            if salary_max:
-                queryset = queryset.filter(salary_min__lte=salary_max)
+                # 薪资范围过滤
+                salary_min = data.get('salary_min')
+                salary_max = data.get('salary_max')
+                if salary_min:
+                    queryset = queryset.filter(salary_max__gte=salary_min)
+                if salary_max:
+                    queryset = queryset.filter(salary_min__lte=salary_max)
             
-            # 技能过滤
-            skills = data.get('skills')
-            if skills:
-                queryset = queryset.filter(
-                    jobskillrequirement__skill_id__in=skills
-                ).distinct()
+                # 技能过滤：EXISTS子查询不会像JOIN那样放大行数，
+                # 免去distinct()的去重排序
+                skills = data.get('skills')
+                if skills:
+                    queryset = queryset.filter(
+                        Exists(
+                            JobSkillRequirement.objects.filter(
+                                job_id=OuterRef('pk'),
+                                skill_id__in=skills,
+                            )
+                        )
+                    )
         
         # 排序
         ordering = self.request.query_params.get('ordering', '-created_at')
-        if ordering in ['created_at', '-created_at', 'salary_min', '-salary_min', 'application_deadline']:
+        if ordering == 'relevance':
+            # 相关度排序：整批行向量化打分后在内存排序
+            return rank_jobs_by_relevance(
+                list(job_list_values(queryset)),
+                salary_min=search_data.get('salary_min'),
+                salary_max=search_data.get('salary_max'),
+                skill_ids=search_data.get('skills'),
+            )
+        if ordering in _ALLOWED_ORDERING:
             queryset = queryset.order_by(ordering)
         else:
             queryset = queryset.order_by('-created_at')
-        
-        return queryset
-    
+
+        # 列表只读取固定列，values()省去模型实例化开销
+        return job_list_values(queryset)
+    
+    def list(self, request, *args, **kwargs):
+        """列表输出直接dump values()字典，跳过DRF序列化器和渲染器"""
+        queryset = self.get_queryset()
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            paginator = self.paginator
+            payload = {
+                'count': paginator.page.paginator.count,
+                'next': paginator.get_next_link(),
+                'previous': paginator.get_previous_link(),
+                'results': [_finalize_list_row(dict(row)) for row in page],
+            }
+            return _json_list_response(payload)
+        return _json_list_response([_finalize_list_row(dict(row)) for row in queryset])
+
     def get_permissions(self):
         """获取权限"""
         if self.request.method == 'POST':
             return [permissions.IsAuthenticated()]
         return [permissions.AllowAny()]
-    
+
     def perform_create(self, serializer):
         """执行创建"""
         # 确保用户是雇主
         if self.request.user.user_type != 'employer':
             raise permissions.PermissionDenied("只有雇主可以发布职位")
         
-        try:
-            employer_profile = EmployerProfile.objects.get(user=self.request.user)
-        except EmployerProfile.DoesNotExist:
+        # cached_property访问器按用户实例缓存，同一请求内不重复查询
+        employer_profile = self.request.user.employer_profile_cached
+        if employer_profile is None:
             raise permissions.PermissionDenied("请先完善雇主档案")
-        
+
         serializer.save(employer=employer_profile)
 
 
-class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
-    """职位详情视图"""
-    queryset = Job.objects.select_related('employer', 'category').prefetch_related(
+class JobEagerLoadingMixin:
+    """视图层的关联预取配置
+
+    查询集整形（select_related/only/annotate）在get_queryset统一完成，
+    集合类关联通过prefetch_related_objects按需加载并缓存在request上，
+    同一请求内重复调用get_object()不会再次预取。
+    """
+    select_related_fields = ('employer', 'category')
+    prefetch_related_fields = (
         'jobskillrequirement_set__skill',
-        'jobskillpreference_set__skill'
+        'jobskillpreference_set__skill',
     )
+
+    def get_queryset(self):
+        return super().get_queryset().select_related(
+            *self.select_related_fields
+        ).only(*JobDetailSerializer.ONLY_FIELDS).annotate(
+            num_applications=Count('applications', distinct=True)
+        )
+
+    def get_object(self):
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        cached = getattr(self.request, '_eager_loaded_job', None)
+        if cached is not None and str(cached.pk) == str(self.kwargs.get(lookup)):
+            return cached
+        obj = super().get_object()
+        prefetch_related_objects([obj], *self.prefetch_related_fields)
+        self.request._eager_loaded_job = obj
+        return obj
+
+
+class JobDetailView(JobEagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
+    """职位详情视图"""
+    queryset = Job.objects.all()
     
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
@@ -156,12 +282,11 @@ class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
         if self.request.user.user_type != 'employer':
             raise permissions.PermissionDenied("只有雇主可以编辑职位")
         
-        try:
-            employer_profile = EmployerProfile.objects.get(user=self.request.user)
-            if job.employer != employer_profile:
-                raise permissions.PermissionDenied("只能编辑自己发布的职位")
-        except EmployerProfile.DoesNotExist:
+        employer_profile = self.request.user.employer_profile_cached
+        if employer_profile is None:
             raise permissions.PermissionDenied("雇主档案不存在")
+        if job.employer != employer_profile:
+            raise permissions.PermissionDenied("只能编辑自己发布的职位")
         
         serializer.save()
     
@@ -171,12 +296,11 @@ class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
         if self.request.user.user_type != 'employer':
             raise permissions.PermissionDenied("只有雇主可以删除职位")
         
-        try:
-            employer_profile = EmployerProfile.objects.get(user=self.request.user)
-            if instance.employer != employer_profile:
-                raise permissions.PermissionDenied("只能删除自己发布的职位")
-        except EmployerProfile.DoesNotExist:
+        employer_profile = self.request.user.employer_profile_cached
+        if employer_profile is None:
             raise permissions.PermissionDenied("雇主档案不存在")
+        if instance.employer != employer_profile:
+            raise permissions.PermissionDenied("只能删除自己发布的职位")
         
         # 软删除
         instance.is_active = False
@@ -189,6 +313,17 @@ class JobCategoryListView(generics.ListAPIView):
     serializer_class = JobCategorySerializer
     permission_classes = [permissions.AllowAny]
 
+    CACHE_KEY = 'jobs:active_categories'
+    CACHE_TTL = 60  # 分类低频变化，短TTL缓存足以挡掉绝大多数查询
+
+    def list(self, request, *args, **kwargs):
+        data = cache.get(self.CACHE_KEY)
+        if data is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        cache.set(self.CACHE_KEY, response.data, self.CACHE_TTL)
+        return response
+
 
 class JobAlertListCreateView(generics.ListCreateAPIView):
     """职位提醒列表和创建视图"""
@@ -200,22 +335,20 @@ class JobAlertListCreateView(generics.ListCreateAPIView):
         if self.request.user.user_type != 'student':
             return JobAlert.objects.none()
         
-        try:
-            student_profile = StudentProfile.objects.get(user=self.request.user)
-            return JobAlert.objects.filter(student=student_profile)
-        except StudentProfile.DoesNotExist:
+        student_profile = self.request.user.student_profile_cached
+        if student_profile is None:
             return JobAlert.objects.none()
+        return JobAlert.objects.filter(student=student_profile)
     
     def perform_create(self, serializer):
         """执行创建"""
         if self.request.user.user_type != 'student':
             raise permissions.PermissionDenied("只有学生可以创建职位提醒")
         
-        try:
-            student_profile = StudentProfile.objects.get(user=self.request.user)
-        except StudentProfile.DoesNotExist:
+        student_profile = self.request.user.student_profile_cached
+        if student_profile is None:
             raise permissions.PermissionDenied("请先完善学生档案")
-        
+
         serializer.save(student=student_profile)
 
 
@@ -229,64 +362,65 @@ class JobAlertDetailView(generics.RetrieveUpdateDestroyAPIView):
         if self.request.user.user_type != 'student':
             return JobAlert.objects.none()
         
-        try:
-            student_profile = StudentProfile.objects.get(user=self.request.user)
-            return JobAlert.objects.filter(student=student_profile)
-        except StudentProfile.DoesNotExist:
+        student_profile = self.request.user.student_profile_cached
+        if student_profile is None:
             return JobAlert.objects.none()
+        return JobAlert.objects.filter(student=student_profile)
 
 
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def job_statistics(request):
     """职位统计信息"""
+    cached_stats = cache.get(STATISTICS_CACHE_KEY)
+    if cached_stats is not None:
+        return Response(cached_stats)
+
+    # 所有统计共用同一个基础查询集，过滤条件只在一处定义
+    active_jobs = Job.objects.filter(is_active=True)
+
+    # 标量统计用条件聚合合并成一条SQL，原来是三次独立扫描
+    has_salary = Q(salary_min__isnull=False, salary_max__isnull=False)
+    scalar_stats = active_jobs.aggregate(
+        total_jobs=Count('id'),
+        recent_jobs=Count(
+            'id',
+            filter=Q(created_at__gte=timezone.now() - timezone.timedelta(days=7))
+        ),
+        avg_min=Avg('salary_min', filter=has_salary),
+        avg_max=Avg('salary_max', filter=has_salary),
+    )
+
     stats = {
-        'total_jobs': Job.objects.filter(is_active=True).count(),
+        'total_jobs': scalar_stats['total_jobs'],
         'jobs_by_type': {},
         'jobs_by_experience': {},
         'jobs_by_location': {},
-        'average_salary': {},
-        'recent_jobs': Job.objects.filter(
-            is_active=True,
-            created_at__gte=timezone.now() - timezone.timedelta(days=7)
-        ).count()
+        'average_salary': {
+            'min': float(scalar_stats['avg_min'] or 0),
+            'max': float(scalar_stats['avg_max'] or 0)
+        },
+        'recent_jobs': scalar_stats['recent_jobs']
     }
-    
+
     # 按类型统计
-    job_types = Job.objects.filter(is_active=True).values('job_type').annotate(
+    job_types = active_jobs.values('job_type').annotate(
         count=Count('id')
     )
     for item in job_types:
         stats['jobs_by_type'][item['job_type']] = item['count']
-    
+
     # 按经验要求统计
-    experience_levels = Job.objects.filter(is_active=True).values('experience_level').annotate(
+    experience_levels = active_jobs.values('experience_level').annotate(
         count=Count('id')
     )
     for item in experience_levels:
         stats['jobs_by_experience'][item['experience_level']] = item['count']
-    
-    # 按地点统计（前10个城市）
-    locations = Job.objects.filter(is_active=True).values('location_city').annotate(
-        count=Count('id')
-    ).order_by('-count')[:10]
-    for item in locations:
-        stats['jobs_by_location'][item['location_city']] = item['count']
-    
-    # 平均薪资统计
-    salary_stats = Job.objects.filter(
-        is_active=True,
-        salary_min__isnull=False,
-        salary_max__isnull=False
-    ).aggregate(
-        avg_min=Avg('salary_min'),
-        avg_max=Avg('salary_max')
-    )
-    stats['average_salary'] = {
-        'min': float(salary_stats['avg_min'] or 0),
-        'max': float(salary_stats['avg_max'] or 0)
-    }
-    
+
+    # 按地点统计（前10个城市）：按小时物化，不随本接口缓存重算
+    stats['jobs_by_location'] = get_location_stats()
+
+    cache.set(STATISTICS_CACHE_KEY, stats, STATISTICS_CACHE_TTL)
     return Response(stats)
 
 
@@ -300,22 +434,25 @@ def my_jobs(request):
             status=status.HTTP_403_FORBIDDEN
         )
     
-    try:
-        employer_profile = EmployerProfile.objects.get(user=request.user)
-    except EmployerProfile.DoesNotExist:
+    employer_profile = request.user.employer_profile_cached
+    if employer_profile is None:
         return Response(
             {'error': '雇主档案不存在'},
             status=status.HTTP_404_NOT_FOUND
         )
     
-    jobs = Job.objects.filter(employer=employer_profile).select_related(
-        'category'
-    ).prefetch_related('application_set')
-    
+    # 申请数走注解计数，不再预取整表申请记录
+    jobs = job_list_values(
+        Job.objects.filter(employer=employer_profile).annotate(
+            num_required_skills=Count('jobskillrequirement', distinct=True),
+            num_applications=Count('applications', distinct=True)
+        )
+    )
+
     # 分页
     paginator = JobPagination()
     page = paginator.paginate_queryset(jobs, request)
-    
+
     serializer = JobListSerializer(page, many=True, context={'request': request})
     return paginator.get_paginated_response(serializer.data)
 
@@ -330,22 +467,18 @@ def apply_job(request, job_id):
             status=status.HTTP_403_FORBIDDEN
         )
     
-    try:
-        student_profile = StudentProfile.objects.get(user=request.user)
-    except StudentProfile.DoesNotExist:
+    student_profile = request.user.student_profile_cached
+    if student_profile is None:
         return Response(
             {'error': '请先完善学生档案'},
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    job = get_object_or_404(Job, id=job_id, is_active=True)
-    
-    # 检查是否已申请
-    if Application.objects.filter(student=student_profile, job=job).exists():
-        return Response(
-            {'error': '您已经申请过这个职位'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
+    # 申请只用到主键和截止日期，不必取整行（description等大文本列）
+    job = get_object_or_404(
+        Job.objects.only('id', 'application_deadline'),
+        id=job_id, is_active=True
+    )
     
     # 检查申请截止日期
     if job.application_deadline and job.application_deadline < timezone.now().date():
@@ -353,15 +486,23 @@ def apply_job(request, job_id):
             {'error': '申请截止日期已过'},
             status=status.HTTP_400_BAD_REQUEST
         )
-    
-    # 创建申请
-    application = Application.objects.create(
+
+    # 创建申请；靠(student, job)唯一约束保证不重复，
+    # 比先exists()再create()少一次查询且并发下无竞态
+    application, created = Application.objects.get_or_create(
         student=student_profile,
         job=job,
-        cover_letter=request.data.get('cover_letter', ''),
-        status='pending'
+        defaults={
+            'cover_letter': request.data.get('cover_letter', ''),
+            'status': 'pending',
+        }
     )
-    
+    if not created:
+        return Response(
+            {'error': '您已经申请过这个职位'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
     return Response(
         {'message': '申请提交成功', 'application_id': application.id},
         status=status.HTTP_201_CREATED
@@ -371,107 +512,155 @@ def apply_job(request, job_id):
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
 def parse_job_description(request):
-    """AI解析职位描述文件"""
+    """AI解析职位描述文件（异步）
+
+    上传文件落盘后交给Celery任务做文本提取和AI解析，立即返回202
+    和task_id供客户端轮询，不再让远程AI调用占着HTTP工作进程；
+    Broker不可用时（本地开发）退化为同步执行。
+    """
+    if 'file' not in request.FILES:
+        return Response(
+            {'message': '请上传文件'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    uploaded_file = request.FILES['file']
+
+    # 验证文件类型
+    allowed_extensions = ['.pdf', '.doc', '.docx', '.txt']
+    file_extension = uploaded_file.name.lower().split('.')[-1]
+    if f'.{file_extension}' not in allowed_extensions:
+        return Response(
+            {'message': '不支持的文件格式，请上传PDF、DOC、DOCX或TXT文件'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    task_id = uuid4().hex
+    storage_path = default_storage.save(
+        f'job_parse/{task_id}.{file_extension}', uploaded_file
+    )
+    cache.set(PARSE_RESULT_CACHE_KEY % task_id, {'status': 'pending'},
+              PARSE_RESULT_TTL)
+
     try:
-        if 'file' not in request.FILES:
-            return Response(
-                {'message': '请上传文件'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        uploaded_file = request.FILES['file']
-        
-        # 验证文件类型
-        allowed_extensions = ['.pdf', '.doc', '.docx', '.txt']
-        file_extension = uploaded_file.name.lower().split('.')[-1]
-        if f'.{file_extension}' not in allowed_extensions:
-            return Response(
-                {'message': '不支持的文件格式，请上传PDF、DOC、DOCX或TXT文件'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # 提取文档文本内容
-        text_content = ""
-        if file_extension == 'pdf':
-            try:
-                import PyPDF2
-                import io
-                
-                pdf_file = io.BytesIO(uploaded_file.read())
-                pdf_reader = PyPDF2.PdfReader(pdf_file)
-                
-                for page in pdf_reader.pages:
-                    text_content += page.extract_text() + "\n"
-                    
-            except Exception as e:
-                logger.error(f"PDF解析失败: {str(e)}")
-                return Response(
-                    {'message': 'PDF文件解析失败'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-        
-        elif file_extension in ['doc', 'docx']:
-            try:
-                import docx
-                import io
-                
-                doc_file = io.BytesIO(uploaded_file.read())
-                doc = docx.Document(doc_file)
-                
-                for paragraph in doc.paragraphs:
-                    text_content += paragraph.text + "\n"
-                    
-            except Exception as e:
-                logger.error(f"Word文档解析失败: {str(e)}")
-                return Response(
-                    {'message': 'Word文档解析失败'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-        
-        elif file_extension == 'txt':
-            try:
-                text_content = uploaded_file.read().decode('utf-8')
-            except UnicodeDecodeError:
-                try:
-                    uploaded_file.seek(0)
-                    text_content = uploaded_file.read().decode('gbk')
-                except UnicodeDecodeError:
-                    return Response(
-                        {'message': '文本文件编码不支持'},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-        
-        # 使用AI解析文本内容
-        from matching.google_ai_service import GoogleAIService
-        
-        ai_service = GoogleAIService()
-        ai_response = ai_service.parse_job_description(text_content)
-        
-        # 解析AI响应
-        parsed_data = _parse_job_ai_response(ai_response)
-        
-        logger.info(f"AI解析职位描述成功: {uploaded_file.name}")
-        return Response(parsed_data)
-        
+        parse_job_description_task.delay(task_id, storage_path, file_extension)
     except Exception as e:
-        logger.error(f"AI解析职位描述异常: {str(e)}")
+        logger.warning(f"Celery不可用，同步解析职位描述: {str(e)}")
+        parse_job_description_task.run(task_id, storage_path, file_extension)
+
+    return Response(
+        {
+            'task_id': task_id,
+            'status': 'pending',
+            'result_url': f'/api/jobs/parse/{task_id}/',
+        },
+        status=status.HTTP_202_ACCEPTED
+    )
+
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def parse_job_description_status(request, task_id):
+    """查询异步解析任务的状态与结果"""
+    result = cache.get(PARSE_RESULT_CACHE_KEY % task_id)
+    if result is None:
         return Response(
-            {
-                'message': 'AI解析失败',
-                'error': str(e),
-                'success': False
-            },
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            {'message': '任务不存在或结果已过期'},
+            status=status.HTTP_404_NOT_FOUND
         )
+    return Response(result)
+
+
+# AI响应的标签行统一用一个预编译正则识别，别名到规范字段的映射
+# 集中在一张表里，新增标签别名只需加一行
+_AI_LABEL_ALIASES = {
+    'Job Title': 'title',
+    'Position': 'title',
+    'Title': 'title',
+    'Job Description': 'description',
+    'Description': 'description',
+    'Job Requirements': 'requirements',
+    'Requirements': 'requirements',
+    'Job Responsibilities': 'responsibilities',
+    'Responsibilities': 'responsibilities',
+    'Job Benefits': 'benefits',
+    'Benefits': 'benefits',
+    'Job Type': 'job_type',
+    'Employment Type': 'job_type',
+    'Experience Level': 'experience_level',
+    'Experience': 'experience_level',
+    'Location': 'location_city',
+    'City': 'location_city',
+    'Remote': 'remote_option',
+    'Work Mode': 'remote_option',
+    'Salary Min': 'salary_min',
+    'Minimum Salary': 'salary_min',
+    'Salary Max': 'salary_max',
+    'Maximum Salary': 'salary_max',
+    'Application Deadline': 'application_deadline',
+    'Deadline': 'application_deadline',
+    'Apply By': 'application_deadline',
+}
+
+_AI_LABEL_RE = re.compile(
+    r'^(%s):\s*(.*)$' % '|'.join(
+        sorted(map(re.escape, _AI_LABEL_ALIASES), key=len, reverse=True)
+    )
+)
+
+_NUMBER_RE = re.compile(r'\d+')
+
+# 枚举识别的关键词表：按序找第一个命中的子串，取代链式elif；
+# 顺序即优先级（如hybrid要先于remote判断）
+_JOB_TYPE_KEYWORDS = (
+    ('full', 'full_time'),
+    ('permanent', 'full_time'),
+    ('part', 'part_time'),
+    ('contract', 'contract'),
+    ('intern', 'internship'),
+    ('freelance', 'freelance'),
+)
+
+_EXPERIENCE_KEYWORDS = (
+    ('senior', 'senior'),
+    ('lead', 'senior'),
+    ('mid', 'mid'),
+    ('intermediate', 'mid'),
+    ('junior', 'junior'),
+    ('entry', 'entry'),
+    ('graduate', 'entry'),
+    ('executive', 'executive'),
+    ('manager', 'executive'),
+)
+
+_REMOTE_KEYWORDS = (
+    ('hybrid', 'hybrid'),
+    ('remote', 'remote'),
+)
+
+
+def _match_keyword_enum(value, table, default):
+    """在关键词表中找第一个命中的子串对应的枚举值"""
+    for keyword, enum_value in table:
+        if keyword in value:
+            return enum_value
+    return default
+
+# 需要跨行收集内容的字段
+_AI_MULTILINE_FIELDS = ('description', 'requirements', 'responsibilities', 'benefits')
 
 
 def _parse_job_ai_response(ai_response):
-    """解析AI响应为结构化数据"""
+    """解析AI响应为结构化数据
+
+    每行只做一次_AI_LABEL_RE匹配即可同时识别标签并取出冒号后的值，
+    替代原来逐行顺序执行的二十多个startswith分支
+    """
     parsed_data = {
         'title': 'Not Provided',
         'description': 'Not Provided',
         'requirements': 'Not Provided',
-        'responsibilities': 'Not Provided',  # 添加职责字段
+        'responsibilities': 'Not Provided',
         'job_type': 'full_time',
         'experience_level': 'entry',
         'location_city': 'Not Provided',
@@ -480,241 +669,122 @@ def _parse_job_ai_response(ai_response):
         'remote_option': 'on_site',
         'salary_min': None,
         'salary_max': None,
-        'benefits': [],  # 改为列表格式
-        'application_deadline': None  # 改为None
+        'benefits': [],
+        'application_deadline': None
     }
-    
+
     if not ai_response:
         return parsed_data
-    
-    lines = ai_response.split('\n')
-    collecting_description = False
-    collecting_requirements = False
-    collecting_responsibilities = False  # 添加职责收集标志
-    collecting_benefits = False
-    description_lines = []
-    requirements_lines = []
-    responsibilities_lines = []  # 添加职责行列表
-    benefits_lines = []
-    
-    for line in lines:
+
+    section_lines = {field: [] for field in _AI_MULTILINE_FIELDS}
+    current_section = None
+
+    # 热循环里把查找都绑定到局部名，省掉每行的全局/属性查找
+    label_match = _AI_LABEL_RE.match
+    label_aliases = _AI_LABEL_ALIASES
+
+    for line in ai_response.split('\n'):
         line = line.strip()
         if not line:
             continue
-        
-        # 检查是否开始收集多行内容
-        if line.startswith('Job Title:') or line.startswith('Position:') or line.startswith('Title:'):
-            parsed_data['title'] = _extract_value_after_colon(line)
-            collecting_description = False
-            collecting_requirements = False
-            collecting_responsibilities = False
-            collecting_benefits = False
-        elif line.startswith('Job Description:') or line.startswith('Description:'):
-            value = _extract_value_after_colon(line)
-            if value and value != "Not Provided":
-                description_lines.append(value)
-            collecting_description = True
-            collecting_requirements = False
-            collecting_responsibilities = False
-            collecting_benefits = False
-        elif line.startswith('Requirements:') or line.startswith('Job Requirements:'):
-            value = _extract_value_after_colon(line)
-            if value and value != "Not Provided":
-                requirements_lines.append(value)
-            collecting_description = False
-            collecting_requirements = True
-            collecting_responsibilities = False
-            collecting_benefits = False
-        elif line.startswith('Responsibilities:') or line.startswith('Job Responsibilities:'):
-            value = _extract_value_after_colon(line)
-            if value and value != "Not Provided":
-                responsibilities_lines.append(value)
-            collecting_description = False
-            collecting_requirements = False
-            collecting_responsibilities = True
-            collecting_benefits = False
-        elif line.startswith('Benefits:') or line.startswith('Job Benefits:'):
-            value = _extract_value_after_colon(line)
-            if value and value != "Not Provided":
-                benefits_lines.append(value)
-            collecting_description = False
-            collecting_requirements = False
-            collecting_responsibilities = False
-            collecting_benefits = True
-        elif line.startswith('Job Type:') or line.startswith('Employment Type:'):
-            job_type_value = _extract_value_after_colon(line).lower()
-            if 'full' in job_type_value or 'permanent' in job_type_value:
-                parsed_data['job_type'] = 'full_time'
-            elif 'part' in job_type_value:
-                parsed_data['job_type'] = 'part_time'
-            elif 'contract' in job_type_value:
-                parsed_data['job_type'] = 'contract'
-            elif 'intern' in job_type_value:
-                parsed_data['job_type'] = 'internship'
-            elif 'freelance' in job_type_value:
-                parsed_data['job_type'] = 'freelance'
-            collecting_description = False
-            collecting_requirements = False
-            collecting_responsibilities = False
-            collecting_benefits = False
-        elif line.startswith('Experience Level:') or line.startswith('Experience:'):
-            exp_value = _extract_value_after_colon(line).lower()
-            if 'senior' in exp_value or 'lead' in exp_value:
-                parsed_data['experience_level'] = 'senior'
-            elif 'mid' in exp_value or 'intermediate' in exp_value:
-                parsed_data['experience_level'] = 'mid'
-            elif 'junior' in exp_value:
-                parsed_data['experience_level'] = 'junior'
-            elif 'entry' in exp_value or 'graduate' in exp_value:
-                parsed_data['experience_level'] = 'entry'
-            elif 'executive' in exp_value or 'manager' in exp_value:
-                parsed_data['experience_level'] = 'executive'
-            collecting_description = False
-            collecting_requirements = False
-            collecting_responsibilities = False
-            collecting_benefits = False
-        elif line.startswith('Location:') or line.startswith('City:'):
-            parsed_data['location_city'] = _extract_value_after_colon(line)
-            collecting_description = False
-            collecting_requirements = False
-            collecting_responsibilities = False
-            collecting_benefits = False
-        elif line.startswith('Remote:') or line.startswith('Work Mode:'):
-            remote_value = _extract_value_after_colon(line).lower()
-            if 'remote' in remote_value and 'hybrid' not in remote_value:
-                parsed_data['remote_option'] = 'remote'
-            elif 'hybrid' in remote_value:
-                parsed_data['remote_option'] = 'hybrid'
-            else:
-                parsed_data['remote_option'] = 'on_site'
-            collecting_description = False
-            collecting_requirements = False
-            collecting_responsibilities = False
-            collecting_benefits = False
-        elif line.startswith('Salary Min:') or line.startswith('Minimum Salary:'):
-            salary_value = _extract_value_after_colon(line)
-            # 提取数字并转换为整数，如果没有找到数字则设为None
-            import re
-            numbers = re.findall(r'\d+', salary_value)
-            if numbers and salary_value.lower() != 'not provided':
-                try:
-                    parsed_data['salary_min'] = int(numbers[0])
-                except (ValueError, IndexError):
-                    parsed_data['salary_min'] = None
-            else:
-                parsed_data['salary_min'] = None
-            collecting_description = False
-            collecting_requirements = False
-            collecting_responsibilities = False
-            collecting_benefits = False
-        elif line.startswith('Salary Max:') or line.startswith('Maximum Salary:'):
-            salary_value = _extract_value_after_colon(line)
-            # 提取数字并转换为整数，如果没有找到数字则设为None
-            import re
-            numbers = re.findall(r'\d+', salary_value)
-            if numbers and salary_value.lower() != 'not provided':
-                try:
-                    parsed_data['salary_max'] = int(numbers[0])
-                except (ValueError, IndexError):
-                    parsed_data['salary_max'] = None
+
+        match = label_match(line)
+        if not match:
+            # 非标签行：归入正在收集的多行字段
+            if current_section:
+                section_lines[current_section].append(line)
+            continue
+
+        field = label_aliases[match.group(1)]
+        value = _clean_label_value(match.group(2))
+        current_section = field if field in section_lines else None
+
+        if current_section:
+            if value != 'Not Provided':
+                section_lines[current_section].append(value)
+        elif field in ('title', 'location_city'):
+            parsed_data[field] = value
+        elif field == 'job_type':
+            parsed_data['job_type'] = _match_keyword_enum(
+                value.lower(), _JOB_TYPE_KEYWORDS, parsed_data['job_type'])
+        elif field == 'experience_level':
+            parsed_data['experience_level'] = _match_keyword_enum(
+                value.lower(), _EXPERIENCE_KEYWORDS, parsed_data['experience_level'])
+        elif field == 'remote_option':
+            parsed_data['remote_option'] = _match_keyword_enum(
+                value.lower(), _REMOTE_KEYWORDS, 'on_site')
+        elif field in ('salary_min', 'salary_max'):
+            numbers = _NUMBER_RE.findall(value)
+            if numbers and value.lower() != 'not provided':
+                parsed_data[field] = int(numbers[0])
             else:
-                parsed_data['salary_max'] = None
-            collecting_description = False
-            collecting_requirements = False
-            collecting_responsibilities = False
-            collecting_benefits = False
-        elif line.startswith('Application Deadline:') or line.startswith('Deadline:') or line.startswith('Apply By:'):
-            deadline_value = _extract_value_after_colon(line)
-            if deadline_value and deadline_value != "Not Provided":
-                # 尝试解析日期格式
+                parsed_data[field] = None
+        elif field == 'application_deadline':
+            if value != 'Not Provided':
                 try:
-                    from datetime import datetime
-                    # 尝试解析YYYY-MM-DD格式
-                    parsed_date = datetime.strptime(deadline_value, '%Y-%m-%d')
-                    parsed_data['application_deadline'] = parsed_date
+                    parsed_data['application_deadline'] = datetime.strptime(value, '%Y-%m-%d')
                 except ValueError:
-                    # 如果解析失败，设为None
                     parsed_data['application_deadline'] = None
-            collecting_description = False
-            collecting_requirements = False
-            collecting_responsibilities = False
-            collecting_benefits = False
-        else:
-            # 收集多行内容
-            if collecting_description and line:
-                if line.startswith('*') or line.startswith('-'):
-                    description_lines.append(line)
-                elif not any(line.startswith(prefix) for prefix in ['Job Title:', 'Position:', 'Title:', 'Requirements:', 'Responsibilities:', 'Benefits:', 'Job Type:', 'Experience:', 'Location:', 'Remote:', 'Salary']):
-                    description_lines.append(line)
-            elif collecting_requirements and line:
-                if line.startswith('*') or line.startswith('-'):
-                    requirements_lines.append(line)
-                elif not any(line.startswith(prefix) for prefix in ['Job Title:', 'Position:', 'Title:', 'Job Description:', 'Description:', 'Responsibilities:', 'Benefits:', 'Job Type:', 'Experience:', 'Location:', 'Remote:', 'Salary']):
-                    requirements_lines.append(line)
-            elif collecting_responsibilities and line:
-                if line.startswith('*') or line.startswith('-'):
-                    responsibilities_lines.append(line)
-                elif not any(line.startswith(prefix) for prefix in ['Job Title:', 'Position:', 'Title:', 'Job Description:', 'Description:', 'Requirements:', 'Benefits:', 'Job Type:', 'Experience:', 'Location:', 'Remote:', 'Salary']):
-                    responsibilities_lines.append(line)
-            elif collecting_benefits and line:
-                if line.startswith('*') or line.startswith('-'):
-                    benefits_lines.append(line)
-                elif not any(line.startswith(prefix) for prefix in ['Job Title:', 'Position:', 'Title:', 'Job Description:', 'Description:', 'Requirements:', 'Responsibilities:', 'Job Type:', 'Experience:', 'Location:', 'Remote:', 'Salary']):
-                    benefits_lines.append(line)
-    
+
     # 组合多行内容
-    if description_lines:
-        parsed_data['description'] = ' '.join(description_lines)
-    if requirements_lines:
-        parsed_data['requirements'] = ' '.join(requirements_lines)
-    if responsibilities_lines:
-        parsed_data['responsibilities'] = ' '.join(responsibilities_lines)
-    if benefits_lines:
-        # 将福利转换为列表格式
-        benefits_text = ' '.join(benefits_lines)
-        if benefits_text and benefits_text != "Not Provided":
-            # 按逗号分割福利项
-            parsed_data['benefits'] = [benefit.strip() for benefit in benefits_text.split(',') if benefit.strip()]
-        else:
-            parsed_data['benefits'] = []
-    
+    for section in ('description', 'requirements', 'responsibilities'):
+        if section_lines[section]:
+            parsed_data[section] = ' '.join(section_lines[section])
+    if section_lines['benefits']:
+        benefits_text = ' '.join(section_lines['benefits'])
+        # 按逗号分割福利项
+        parsed_data['benefits'] = [
+            benefit.strip() for benefit in benefits_text.split(',') if benefit.strip()
+        ]
+
     return parsed_data
 
 
-def _extract_value_after_colon(line):
-    """从冒号后提取值"""
-    if ':' in line:
-        value = line.split(':', 1)[1].strip()
-        # 移除方括号标记
-        if value.startswith('[') and value.endswith(']'):
-            value = value[1:-1].strip()
-        return value if value and value.lower() != 'not provided' else "Not Provided"
-    return "Not Provided"
+def _clean_label_value(value):
+    """规整标签行冒号后的值"""
+    value = value.strip()
+    # 移除方括号标记
+    if value.startswith('[') and value.endswith(']'):
+        value = value[1:-1].strip()
+    return value if value and value.lower() != 'not provided' else "Not Provided"
 
 
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def featured_jobs(request):
     """推荐职位"""
-    jobs = Job.objects.filter(
-        is_active=True,
-        is_featured=True
-    ).select_related('employer', 'category')[:10]
-    
-    serializer = JobListSerializer(jobs, many=True, context={'request': request})
-    return Response(serializer.data)
+    data = cache.get(FEATURED_JOBS_CACHE_KEY)
+    if data is None:
+        # values()行直接整形输出，省掉DRF逐行构造serializer的开销
+        rows = job_list_values(
+            Job.objects.filter(
+                is_active=True,
+                is_featured=True
+            ).annotate(
+                num_required_skills=Count('jobskillrequirement', distinct=True),
+                num_applications=Count('applications', distinct=True)
+            )
+        )[:10]
+        data = [_finalize_list_row(dict(row)) for row in rows]
+        cache.set(FEATURED_JOBS_CACHE_KEY, data, HOME_LIST_CACHE_TTL)
+    return _json_list_response(data)
 
 
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def recent_jobs(request):
     """最新职位"""
-    jobs = Job.objects.filter(is_active=True).select_related(
-        'employer', 'category'
-    ).order_by('-created_at')[:20]
-    
-    serializer = JobListSerializer(jobs, many=True, context={'request': request})
-    return Response(serializer.data)
+    data = cache.get(RECENT_JOBS_CACHE_KEY)
+    if data is None:
+        rows = job_list_values(
+            Job.objects.filter(is_active=True).annotate(
+                num_required_skills=Count('jobskillrequirement', distinct=True),
+                num_applications=Count('applications', distinct=True)
+            ).order_by('-created_at')
+        )[:20]
+        data = [_finalize_list_row(dict(row)) for row in rows]
+        cache.set(RECENT_JOBS_CACHE_KEY, data, HOME_LIST_CACHE_TTL)
+    return _json_list_response(data)
 
 
 @api_view(['POST'])
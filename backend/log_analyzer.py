@@ -6,14 +6,22 @@
 
 import os
 import re
+import sys
 import json
+import mmap
+import heapq
+import array
 import argparse
 from datetime import datetime, timedelta
 from pathlib import Path
 from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional, Tuple
 import statistics
 
+import numpy as np
+
 # 移除可视化依赖，使用文本报告
 HAS_VISUALIZATION = False
 
@@ -24,325 +32,514 @@ except ImportError:
     pass
 
 
+# 日志行格式: 2025-09-30 01:26:11,112 - __main__ - INFO - 消息
+# 模块级编译一次，显式锚定首尾；re.ASCII让\d/\w/\S跳过Unicode类表。
+# logger名没有分析器用到，不捕获，省掉每行一个分组子串的构造
+_LOG_RE = re.compile(
+    r'\A(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2}):(\d{2}),(\d{3})'
+    r' - (?:\S+) - (\w+) - (.+)\Z',
+    re.ASCII
+)
+
+# 字节版模式：对mmap后的整个文件一次finditer，尾部的lookahead把
+# 跨行消息（traceback等）连同条目一起捕获，省掉逐行decode和
+# Python层的续行拼接
+_LOG_RE_B = re.compile(
+    rb'^(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2}):(\d{2}),(\d{3})'
+    rb' - (?:\S+) - (\w+) - (.*?)(?=\n\d{4}-\d{2}-\d{2} |\Z)',
+    re.M | re.S
+)
+
+
+# 消息分类关键词：解析时用一个合并的alternation正则扫一次打上标签，
+# 各分析器按标签分派，不再各自对每条消息做多次子串搜索
+_TAGS = (
+    '开始处理文件:',
+    '步骤1: 提取文档内容',
+    '成功提取文本内容',
+    '步骤2: AI解析职位描述',
+    'AI解析完成',
+    'AI解析失败',
+    '步骤3: 保存到数据库',
+    '成功保存职位到数据库',
+    '文件处理完成',
+    '文件处理失败:',
+    'AI原始响应:',
+    '职位详情:',
+)
+
+(TAG_FILE_START, TAG_EXTRACT_START, TAG_EXTRACT_DONE, TAG_AI_START,
+ TAG_AI_DONE, TAG_AI_FAILED, TAG_DB_START, TAG_DB_DONE,
+ TAG_FILE_DONE, TAG_FILE_FAILED, TAG_AI_RESPONSE, TAG_JOB_DETAILS) = range(len(_TAGS))
+TAG_NONE = -1
+
+# 每个关键词占一个分组，命中后用lastindex直接得到标签编号，
+# 不用构造命中子串再查字典（多模式匹配器里按模式id回调的做法）
+_TAG_RE = re.compile('|'.join('(%s)' % re.escape(tag) for tag in _TAGS))
+
+
+def _tag_message(message: str, _search=_TAG_RE.search) -> int:
+    """给消息打分类标签，未命中任何关键词时返回TAG_NONE"""
+    match = _search(message)
+    return match.lastindex - 1 if match else TAG_NONE
+
+
+# 日志级别编码成小整数存储；标准级别之外归入OTHER
+_LEVEL_NAMES = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL', 'OTHER')
+_LEVEL_INDEX = {name: i for i, name in enumerate(_LEVEL_NAMES)}
+LEVEL_ERROR = _LEVEL_INDEX['ERROR']
+LEVEL_OTHER = _LEVEL_INDEX['OTHER']
+
+# "最近的错误"展示条数
+RECENT_ERRORS_LIMIT = 5
+
+# 时间戳在内部统一存为距epoch的秒数（float），时长计算只做
+# 浮点减法，不为每次求差构造timedelta；datetime只在报告输出
+# 边界还原。日志时间无时区，epoch也按naive时间起算
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _day_epoch(year: int, month: int, day: int,
+               _cache={}, _datetime=datetime, _epoch=_EPOCH) -> float:
+    """某天零点的epoch秒数，按日缓存；非法日期抛ValueError
+
+    日志按天成卷，同一天的条目只在首条时真正构造datetime。
+    """
+    key = (year, month, day)
+    ts = _cache.get(key)
+    if ts is None:
+        ts = (_datetime(year, month, day) - _epoch).total_seconds()
+        _cache[key] = ts
+    return ts
+
+
+def _from_epoch(ts: float) -> datetime:
+    """把epoch秒数还原成datetime，仅用于报告排版"""
+    return _EPOCH + timedelta(seconds=ts)
+
+
+@dataclass
+class ParsedLog:
+    """解析结果的列式（SoA）存储
+
+    各字段是按条目下标对齐的平行数组。相比每条日志一个dict，
+    百万行日志少分配百万个dict对象，顺序扫描对缓存也更友好。
+    """
+    timestamps: List[float] = field(default_factory=list)
+    levels: List[int] = field(default_factory=list)
+    messages: List[str] = field(default_factory=list)
+    tags: List[int] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def append(self, timestamp: float, level: int, message: str, tag: int):
+        self.timestamps.append(timestamp)
+        self.levels.append(level)
+        self.messages.append(message)
+        self.tags.append(tag)
+
+    def extend(self, other: 'ParsedLog'):
+        self.timestamps += other.timestamps
+        self.levels += other.levels
+        self.messages += other.messages
+        self.tags += other.tags
+
+
+@dataclass
+class AggregatedStats:
+    """逐文件累计出的全部分析指标
+
+    各analyze_*方法只负责把这里的数据排版输出。每个文件解析完
+    立即聚合进来再丢弃，常驻内存只有统计量本身，与日志总量无关。
+    """
+    total_entries: int = 0
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+    level_counts: Counter = field(default_factory=Counter)      # 级别编码 -> 条数
+    tag_counts: Counter = field(default_factory=Counter)        # 标签 -> 条数
+    # 步骤耗时存成紧凑的双精度数组，免去每个时长的float装箱
+    step_times: Dict[str, array.array] = field(
+        default_factory=lambda: defaultdict(lambda: array.array('d')))
+    # 按时间戳保留最近几条错误的有界最小堆，旧错误被顶出
+    recent_errors: List[Tuple[float, str]] = field(default_factory=list)
+    error_types: Counter = field(default_factory=Counter)       # 错误类型 -> 条数
+    error_hours: List[int] = field(default_factory=lambda: [0] * 24)
+    ai_response_total_len: int = 0
+    created_jobs: List[str] = field(default_factory=list)
+    job_details: List[str] = field(default_factory=list)
+    # 文件处理步骤的进行中状态；文件按时间顺序依次聚合，
+    # 跨文件的处理周期也能正确接续
+    current_process: Dict[str, float] = field(default_factory=dict)
+
+
+def _scan_buffer(buf, _finditer=_LOG_RE_B.finditer, _day_epoch=_day_epoch,
+                 _level_index=_LEVEL_INDEX, _tag=_tag_message) -> ParsedLog:
+    """扫描整个字节缓冲区，产出列式解析结果
+
+    刻意做成不带self的顶层函数，依赖全部通过默认参数绑定为局部名：
+    CPython少做每次迭代的全局/属性查找，换到PyPy跑批量分析时
+    追踪JIT也能对这个热循环做特化。
+    """
+    log = ParsedLog()
+    append = log.append
+
+    for match in _finditer(buf):
+        groups = match.groups()
+        try:
+            timestamp = _day_epoch(int(groups[0]), int(groups[1]), int(groups[2]))
+        except ValueError:
+            continue
+        hour = int(groups[3])
+        minute = int(groups[4])
+        second = int(groups[5])
+        if hour > 23 or minute > 59 or second > 59:
+            continue
+        timestamp += hour * 3600.0 + minute * 60.0 + second + int(groups[6]) / 1000.0
+
+        message = groups[8].decode('utf-8', 'replace')
+        if '\n' in message:
+            # 跨行消息按原来的逐行strip语义规整
+            message = '\n'.join(
+                part.strip() for part in message.split('\n') if part.strip()
+            )
+        else:
+            message = message.strip()
+
+        level = groups[7].decode('ascii', 'replace')
+        append(
+            timestamp,
+            _level_index.get(level, LEVEL_OTHER),
+            message,
+            _tag(message),
+        )
+
+    return log
+
+
 class LogAnalyzer:
     """日志分析器"""
-    
+
     def __init__(self, log_dir='logs'):
         """初始化日志分析器"""
         self.log_dir = Path(log_dir)
-        self.log_pattern = re.compile(
-            r'(?P<timestamp>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - '
-            r'(?P<logger>\S+) - '
-            r'(?P<level>\w+) - '
-            r'(?P<function>\w+):(?P<line>\d+) - '
-            r'(?P<message>.*)'
-        )
-        
-    def parse_log_file(self, file_path: Path) -> List[Dict[str, Any]]:
-        """解析日志文件"""
-        entries = []
-        current_entry = None
-        
+
+    def parse_log_file(self, file_path: Path) -> ParsedLog:
+        """解析日志文件为列式存储
+
+        文件mmap进内存后用字节正则一次finditer全文，只对命中的
+        分组做decode；空文件等映射不了的情况退化为整读字节串，
+        走同一个匹配循环。
+        """
+        log = ParsedLog()
+
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line:  # 跳过空行
-                        continue
-                    
-                    # 尝试解析为新的日志条目
-                    entry = self.parse_log_line(line)
-                    if entry:
-                        # 如果有当前条目，先保存它
-                        if current_entry:
-                            current_entry['file'] = file_path.name
-                            entries.append(current_entry)
-                        
-                        # 开始新的条目
-                        current_entry = entry
-                        current_entry['line_number'] = line_num
-                    else:
-                        # 这是多行消息的延续
-                        if current_entry:
-                            current_entry['message'] += '\n' + line
-                        else:
-                            # 调试：打印无法解析的行
-                            print(f"无法解析第{line_num}行: {line[:100]}")
-                
-                # 保存最后一个条目
-                if current_entry:
-                    current_entry['file'] = file_path.name
-                    entries.append(current_entry)
-                    
+            with open(file_path, 'rb') as f:
+                try:
+                    buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (ValueError, OSError):
+                    buf = f.read()
+
+                log = _scan_buffer(buf)
+
+                if isinstance(buf, mmap.mmap):
+                    buf.close()
+
         except Exception as e:
             print(f"解析文件 {file_path} 时出错: {e}")
-        
-        return entries
-    
-    def parse_log_line(self, line: str) -> Optional[Dict[str, Any]]:
-        """解析单行日志"""
-        # 匹配日志格式: 2025-09-30 01:26:11,112 - __main__ - INFO - 消息
-        log_pattern = r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - (\S+) - (\w+) - (.+)'
-        match = re.match(log_pattern, line.strip())
-        
+
+        return log
+
+    @staticmethod
+    def _parse_file_worker(file_path: Path) -> ParsedLog:
+        """进程池里的解析入口，必须可pickle所以做成staticmethod"""
+        return LogAnalyzer().parse_log_file(file_path)
+
+    def parse_log_line(self, line: str) -> Optional[Tuple[float, int, str, int]]:
+        """解析单行日志，返回(epoch秒时间戳, 级别编码, 消息, 标签)"""
+        # 先用几次定点字符比较筛掉续行/杂行（traceback为主），
+        # 只有以合法时间戳开头的行才进正则引擎
+        if len(line) < 24 or line[4] != '-' or line[7] != '-' or line[10] != ' ':
+            return None
+
+        match = _LOG_RE.match(line)
+
         if not match:
             return None
-        
-        timestamp_str, logger_name, level, message = match.groups()
-        
+
+        year, month, day, hour, minute, second, ms, level, message = match.groups()
+
         try:
-            # 解析时间戳，将逗号替换为点号以匹配Python的微秒格式
-            timestamp_str_fixed = timestamp_str.replace(',', '.')
-            timestamp = datetime.strptime(timestamp_str_fixed, '%Y-%m-%d %H:%M:%S.%f')
+            # 时间戳格式固定，直接按整数分量算epoch秒，
+            # 省掉strptime每次解析格式串的开销
+            timestamp = _day_epoch(int(year), int(month), int(day))
         except ValueError:
             return None
-        
-        return {
-            'timestamp': timestamp,
-            'logger': logger_name,
-            'level': level,
-            'message': message,
-            'raw_line': line.strip()
-        }
+        hour, minute, second = int(hour), int(minute), int(second)
+        if hour > 23 or minute > 59 or second > 59:
+            return None
+        timestamp += hour * 3600.0 + minute * 60.0 + second + int(ms) / 1000.0
+
+        return (
+            timestamp,
+            _LEVEL_INDEX.get(level, LEVEL_OTHER),
+            message,
+            _tag_message(message),
+        )
     
-    def analyze_processing_performance(self, entries):
-        """分析处理性能"""
-        print("\n" + "="*60)
-        print("📊 处理性能分析")
-        print("="*60)
-        
-        # 统计各个步骤的耗时
-        step_times = defaultdict(list)
-        current_process = {}
-        
-        for entry in entries:
-            message = entry['message']
-            timestamp = entry['timestamp']
-            
-            if '开始处理文件:' in message:
+    def _accumulate(self, stats: AggregatedStats, log: ParsedLog):
+        """把一个文件的解析结果聚合进统计量，单次遍历覆盖全部维度
+
+        五个分析维度原来各自重扫一遍条目列表；大条目列表下分析是
+        内存带宽受限的，融合成一次扫描后每个条目只过一遍缓存。
+        逐文件调用，条目列表聚合后即可释放。
+        """
+        stats.total_entries += len(log)
+
+        # 条目按时间有序到达（文件名排序+文件内追加写），时间范围
+        # 取首末条目即可，不必逐条比较min/max
+        if log.timestamps:
+            if stats.start_time is None:
+                stats.start_time = log.timestamps[0]
+            stats.end_time = log.timestamps[-1]
+
+        step_times = stats.step_times
+        recent_errors = stats.recent_errors
+        current_process = stats.current_process
+
+        for timestamp, level, message, tag in zip(
+                log.timestamps, log.levels, log.messages, log.tags):
+            stats.level_counts[level] += 1
+            stats.tag_counts[tag] += 1
+
+            if level == LEVEL_ERROR:
+                # 有界堆保留时间戳最大的几条，不随错误总量增长
+                record = (timestamp, message)
+                if len(recent_errors) < RECENT_ERRORS_LIMIT:
+                    heapq.heappush(recent_errors, record)
+                elif record > recent_errors[0]:
+                    heapq.heappushpop(recent_errors, record)
+                head, sep, _ = message.partition(':')
+                stats.error_types[head.strip() if sep else "未知错误"] += 1
+                stats.error_hours[int(timestamp // 3600) % 24] += 1
+
+            if tag == TAG_NONE:
+                continue
+
+            if tag == TAG_FILE_START:
                 current_process['start'] = timestamp
-            elif '步骤1: 提取文档内容' in message:
+            elif tag == TAG_EXTRACT_START:
                 current_process['extract_start'] = timestamp
-            elif '成功提取文本内容' in message:
+            elif tag == TAG_EXTRACT_DONE:
                 if 'extract_start' in current_process:
-                    duration = (timestamp - current_process['extract_start']).total_seconds()
+                    duration = timestamp - current_process['extract_start']
                     step_times['文档提取'].append(duration)
-            elif '步骤2: AI解析职位描述' in message:
+            elif tag == TAG_AI_START:
                 current_process['ai_start'] = timestamp
-            elif 'AI解析完成' in message:
+            elif tag == TAG_AI_DONE:
                 if 'ai_start' in current_process:
-                    duration = (timestamp - current_process['ai_start']).total_seconds()
+                    duration = timestamp - current_process['ai_start']
                     step_times['AI解析'].append(duration)
-            elif '步骤3: 保存到数据库' in message:
+            elif tag == TAG_DB_START:
                 current_process['db_start'] = timestamp
-            elif '成功保存职位到数据库' in message:
+            elif tag == TAG_DB_DONE:
                 if 'db_start' in current_process:
-                    duration = (timestamp - current_process['db_start']).total_seconds()
+                    duration = timestamp - current_process['db_start']
                     step_times['数据库保存'].append(duration)
-            elif '文件处理完成' in message:
+                # 提取职位ID；partition只切第一次出现，不分配整表
+                _, sep, rest = message.partition('ID:')
+                if sep:
+                    stats.created_jobs.append(rest.split(None, 1)[0])
+            elif tag == TAG_FILE_DONE:
                 if 'start' in current_process:
-                    duration = (timestamp - current_process['start']).total_seconds()
+                    duration = timestamp - current_process['start']
                     step_times['总处理时间'].append(duration)
-                current_process = {}
-        
-        # 输出性能统计
-        for step, times in step_times.items():
+                current_process.clear()
+            elif tag == TAG_AI_RESPONSE:
+                # 累加响应长度，均值在输出时用计数求得
+                stats.ai_response_total_len += \
+                    len(message.partition('AI原始响应:')[2].strip())
+            elif tag == TAG_JOB_DETAILS:
+                stats.job_details.append(message.partition('职位详情:')[2].strip())
+
+    def analyze_processing_performance(self, stats: AggregatedStats):
+        """输出处理性能分析"""
+        # 整段报告攒进缓冲一次写出，免去逐行print的加锁和刷新
+        buf = ["\n" + "="*60, "📊 处理性能分析", "="*60]
+
+        # 归约交给NumPy的C实现；frombuffer零拷贝复用array的存储
+        for step, times in stats.step_times.items():
             if times:
-                avg_time = sum(times) / len(times)
-                min_time = min(times)
-                max_time = max(times)
-                print(f"\n{step}:")
-                print(f"  平均耗时: {avg_time:.2f}秒")
-                print(f"  最短耗时: {min_time:.2f}秒")
-                print(f"  最长耗时: {max_time:.2f}秒")
-                print(f"  处理次数: {len(times)}")
+                arr = np.frombuffer(times, dtype=np.float64)
+                buf.append(f"\n{step}:")
+                buf.append(f"  平均耗时: {arr.mean():.2f}秒")
+                buf.append(f"  最短耗时: {arr.min():.2f}秒")
+                buf.append(f"  最长耗时: {arr.max():.2f}秒")
+                buf.append(f"  处理次数: {len(times)}")
+
+        sys.stdout.write('\n'.join(buf) + '\n')
     
-    def analyze_error_patterns(self, entries):
-        """分析错误模式"""
-        print("\n" + "="*60)
-        print("🚨 错误模式分析")
-        print("="*60)
-        
-        error_entries = [e for e in entries if e['level'] == 'ERROR']
-        
-        if not error_entries:
-            print("没有发现错误日志")
+    def analyze_error_patterns(self, stats: AggregatedStats):
+        """输出错误模式分析"""
+        buf = ["\n" + "="*60, "🚨 错误模式分析", "="*60]
+
+        if not stats.level_counts[LEVEL_ERROR]:
+            buf.append("没有发现错误日志")
+            sys.stdout.write('\n'.join(buf) + '\n')
             return
-        
-        # 错误类型统计
-        error_types = {}
-        for entry in error_entries:
-            message = entry['message']
-            # 提取错误类型
-            if ':' in message:
-                error_type = message.split(':')[0].strip()
-            else:
-                error_type = "未知错误"
-            
-            error_types[error_type] = error_types.get(error_type, 0) + 1
-        
-        print(f"错误类型分布:")
-        for error_type, count in sorted(error_types.items(), key=lambda x: x[1], reverse=True):
-            print(f"  {error_type}: {count}")
-        
+
+        buf.append(f"错误类型分布:")
+        for error_type, count in sorted(stats.error_types.items(), key=lambda x: x[1], reverse=True):
+            buf.append(f"  {error_type}: {count}")
+
         # 显示最近的错误
-        print(f"\n最近的错误 (最多显示5条):")
-        recent_errors = sorted(error_entries, key=lambda x: x['timestamp'], reverse=True)[:5]
-        for i, entry in enumerate(recent_errors, 1):
-            print(f"{i}. [{entry['timestamp']}] {entry['message']}")
-        
-        # 错误时间分布
-        error_hours = {}
-        for entry in error_entries:
-            hour = entry['timestamp'].hour
-            error_hours[hour] = error_hours.get(hour, 0) + 1
-        
-        if error_hours:
-            print(f"\n错误时间分布:")
-            for hour in sorted(error_hours.keys()):
-                print(f"  {hour:02d}:00-{hour:02d}:59: {error_hours[hour]} 个错误")
+        buf.append(f"\n最近的错误 (最多显示{RECENT_ERRORS_LIMIT}条):")
+        recent_errors = sorted(stats.recent_errors, key=lambda x: x[0], reverse=True)
+        for i, (timestamp, message) in enumerate(recent_errors, 1):
+            buf.append(f"{i}. [{_from_epoch(timestamp)}] {message}")
+
+        buf.append(f"\n错误时间分布:")
+        for hour, count in enumerate(stats.error_hours):
+            if count:
+                buf.append(f"  {hour:02d}:00-{hour:02d}:59: {count} 个错误")
+
+        sys.stdout.write('\n'.join(buf) + '\n')
     
-    def analyze_ai_performance(self, entries):
-        """分析AI性能"""
-        print("\n" + "="*60)
-        print("🤖 AI解析性能分析")
-        print("="*60)
-        
-        ai_success = 0
-        ai_failure = 0
-        ai_response_lengths = []
-        
-        for entry in entries:
-            message = entry['message']
-            
-            if 'AI解析完成' in message:
-                ai_success += 1
-            elif 'AI解析失败' in message:
-                ai_failure += 1
-            elif 'AI原始响应:' in message:
-                # 提取响应长度
-                response_text = message.split('AI原始响应:')[1].strip()
-                ai_response_lengths.append(len(response_text))
-        
+    def analyze_ai_performance(self, stats: AggregatedStats):
+        """输出AI性能分析"""
+        buf = ["\n" + "="*60, "🤖 AI解析性能分析", "="*60]
+
+        ai_success = stats.tag_counts[TAG_AI_DONE]
+        ai_failure = stats.tag_counts[TAG_AI_FAILED]
+        ai_response_count = stats.tag_counts[TAG_AI_RESPONSE]
+
         total_ai_calls = ai_success + ai_failure
-        
+
         if total_ai_calls > 0:
             success_rate = (ai_success / total_ai_calls) * 100
-            print(f"\nAI解析成功率: {success_rate:.1f}% ({ai_success}/{total_ai_calls})")
-            print(f"AI解析失败次数: {ai_failure}")
-            
-            if ai_response_lengths:
-                avg_response_length = sum(ai_response_lengths) / len(ai_response_lengths)
-                print(f"平均响应长度: {avg_response_length:.0f}字符")
+            buf.append(f"\nAI解析成功率: {success_rate:.1f}% ({ai_success}/{total_ai_calls})")
+            buf.append(f"AI解析失败次数: {ai_failure}")
+
+            if ai_response_count:
+                avg_response_length = stats.ai_response_total_len / ai_response_count
+                buf.append(f"平均响应长度: {avg_response_length:.0f}字符")
         else:
-            print("没有发现AI解析记录")
-    
-    def analyze_database_operations(self, entries):
-        """分析数据库操作"""
-        print("\n" + "="*60)
-        print("💾 数据库操作分析")
-        print("="*60)
-        
-        db_saves = 0
-        created_jobs = []
-        
-        for entry in entries:
-            message = entry['message']
-            
-            if '成功保存职位到数据库' in message:
-                db_saves += 1
-                # 提取职位ID
-                if 'ID:' in message:
-                    job_id = message.split('ID:')[1].strip().split()[0]
-                    created_jobs.append(job_id)
-            elif '职位详情:' in message:
-                # 提取职位详情
-                details = message.split('职位详情:')[1].strip()
-                print(f"  创建职位: {details}")
-        
-        print(f"\n成功保存到数据库: {db_saves}次")
-        print(f"创建的职位ID: {', '.join(created_jobs) if created_jobs else '无'}")
+            buf.append("没有发现AI解析记录")
+
+        sys.stdout.write('\n'.join(buf) + '\n')
     
-    def generate_summary_report(self, entries):
+    def analyze_database_operations(self, stats: AggregatedStats):
+        """输出数据库操作分析"""
+        buf = ["\n" + "="*60, "💾 数据库操作分析", "="*60]
+
+        for details in stats.job_details:
+            buf.append(f"  创建职位: {details}")
+
+        db_saves = stats.tag_counts[TAG_DB_DONE]
+        created_jobs = stats.created_jobs
+
+        buf.append(f"\n成功保存到数据库: {db_saves}次")
+        buf.append(f"创建的职位ID: {', '.join(created_jobs) if created_jobs else '无'}")
+
+        sys.stdout.write('\n'.join(buf) + '\n')
+
+    def generate_summary_report(self, stats: AggregatedStats):
         """生成汇总报告"""
-        print("\n" + "="*60)
-        print("📋 处理汇总报告")
-        print("="*60)
-        
-        if not entries:
-            print("没有找到日志条目")
+        buf = ["\n" + "="*60, "📋 处理汇总报告", "="*60]
+
+        if not stats.total_entries:
+            buf.append("没有找到日志条目")
+            sys.stdout.write('\n'.join(buf) + '\n')
             return
-        
-        # 时间范围
-        start_time = min(e['timestamp'] for e in entries)
-        end_time = max(e['timestamp'] for e in entries)
+
+        # 时间范围；epoch秒只在这里还原成datetime做排版
+        start_time = _from_epoch(stats.start_time)
+        end_time = _from_epoch(stats.end_time)
         duration = end_time - start_time
-        
-        # 日志级别统计
-        level_counts = Counter(e['level'] for e in entries)
-        
+
+        # 日志级别统计（按出现次数排序输出）
+        level_counts = Counter({
+            _LEVEL_NAMES[code]: count
+            for code, count in stats.level_counts.items()
+        })
+
         # 处理的文件数量
-        processed_files = len([e for e in entries if '开始处理文件:' in e['message']])
-        completed_files = len([e for e in entries if '文件处理完成' in e['message']])
-        failed_files = len([e for e in entries if '文件处理失败:' in e['message']])
-        
-        print(f"\n时间范围: {start_time.strftime('%Y-%m-%d %H:%M:%S')} - {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"总持续时间: {duration}")
-        print(f"总日志条目: {len(entries)}")
-        
-        print(f"\n日志级别分布:")
+        tag_counts = stats.tag_counts
+        processed_files = tag_counts[TAG_FILE_START]
+        completed_files = tag_counts[TAG_FILE_DONE]
+        failed_files = tag_counts[TAG_FILE_FAILED]
+
+        buf.append(f"\n时间范围: {start_time.strftime('%Y-%m-%d %H:%M:%S')} - {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        buf.append(f"总持续时间: {duration}")
+        buf.append(f"总日志条目: {stats.total_entries}")
+
+        buf.append(f"\n日志级别分布:")
         for level, count in level_counts.most_common():
-            print(f"  {level}: {count}")
-        
-        print(f"\n文件处理统计:")
-        print(f"  开始处理: {processed_files}")
-        print(f"  成功完成: {completed_files}")
-        print(f"  处理失败: {failed_files}")
-        
+            buf.append(f"  {level}: {count}")
+
+        buf.append(f"\n文件处理统计:")
+        buf.append(f"  开始处理: {processed_files}")
+        buf.append(f"  成功完成: {completed_files}")
+        buf.append(f"  处理失败: {failed_files}")
+
         if processed_files > 0:
             success_rate = (completed_files / processed_files) * 100
-            print(f"  成功率: {success_rate:.1f}%")
+            buf.append(f"  成功率: {success_rate:.1f}%")
+
+        sys.stdout.write('\n'.join(buf) + '\n')
     
     def analyze_logs(self, date_filter=None):
         """分析日志"""
         print("🔍 开始分析日志...")
         
-        # 查找日志文件
+        # 查找日志文件；scandir直接用目录项信息过滤，免去glob的逐项stat
+        prefix = f"auto_upload_{date_filter}" if date_filter else "auto_upload_"
         log_files = []
-        if date_filter:
-            pattern = f"auto_upload_{date_filter}*.log"
-        else:
-            pattern = "auto_upload_*.log"
-        
-        for log_file in self.log_dir.glob(pattern):
-            if not log_file.name.endswith('_errors.log'):  # 排除错误专用日志
-                log_files.append(log_file)
-        
+        try:
+            with os.scandir(self.log_dir) as dir_iter:
+                for dir_entry in dir_iter:
+                    name = dir_entry.name
+                    if (name.startswith(prefix) and name.endswith('.log')
+                            and not name.endswith('_errors.log')):  # 排除错误专用日志
+                        log_files.append(Path(dir_entry.path))
+        except FileNotFoundError:
+            pass
+
         if not log_files:
-            print(f"没有找到匹配的日志文件: {pattern}")
+            print(f"没有找到匹配的日志文件: {prefix}*.log")
             return
         
         print(f"找到 {len(log_files)} 个日志文件")
         
-        # 解析所有日志文件
-        all_entries = []
-        for log_file in sorted(log_files):
-            print(f"解析日志文件: {log_file}")
-            entries = self.parse_log_file(log_file)
-            all_entries.extend(entries)
-        
-        if not all_entries:
+        # 解析所有日志文件。解析是CPU密集型（正则+datetime构造），
+        # 多文件时用进程池并行；单文件直接串行，省去进程启动开销。
+        # 每个文件解析完立即聚合进统计量再释放，不把全量条目
+        # 攒在内存里，峰值占用只取决于最大的单个文件
+        log_files.sort()
+        stats = AggregatedStats()
+        if len(log_files) > 1:
+            with ProcessPoolExecutor() as executor:
+                results = executor.map(self._parse_file_worker, log_files)
+                for log_file, parsed in zip(log_files, results):
+                    print(f"解析日志文件: {log_file}")
+                    self._accumulate(stats, parsed)
+        else:
+            for log_file in log_files:
+                print(f"解析日志文件: {log_file}")
+                self._accumulate(stats, self.parse_log_file(log_file))
+
+        if not stats.total_entries:
             print("没有找到有效的日志条目")
             return
-        
-        print(f"总共解析了 {len(all_entries)} 条日志")
-        
-        # 执行各种分析
-        self.generate_summary_report(all_entries)
-        self.analyze_processing_performance(all_entries)
-        self.analyze_error_patterns(all_entries)
-        self.analyze_ai_performance(all_entries)
-        self.analyze_database_operations(all_entries)
+
+        print(f"总共解析了 {stats.total_entries} 条日志")
+
+        # 各分析器只做排版输出
+        self.generate_summary_report(stats)
+        self.analyze_processing_performance(stats)
+        self.analyze_error_patterns(stats)
+        self.analyze_ai_performance(stats)
+        self.analyze_database_operations(stats)
         
         print("\n" + "="*60)
         print("✅ 日志分析完成")
@@ -3,11 +3,17 @@
 实现学生与职位的智能匹配逻辑
 """
 
+import hashlib
+import json
 import numpy as np
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
-from django.db.models import Q, Prefetch
+from django.core.cache import cache
+from django.db.models import Avg, Count, Q, Prefetch
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from decouple import config
 import logging
 
 from users.models import StudentProfile, StudentSkill, Skill
@@ -17,35 +23,112 @@ from .google_ai_service import google_ai_service
 
 logger = logging.getLogger(__name__)
 
+# AI匹配分析缓存：按学生/职位加数据指纹做键，
+# 底层数据变化时指纹随之变化，旧缓存自然失效
+AI_ANALYSIS_CACHE_KEY = 'ai_match:%s:%s:%s'
+AI_ANALYSIS_CACHE_TTL = 86400
+
+# 批量落库的分批大小：默认值对Postgres是比较稳的折中，
+# 行特别宽（match_details大）或内存紧张时可通过环境变量调小
+MATCH_BULK_BATCH_SIZE = config('MATCH_BULK_BATCH_SIZE', default=1000, cast=int)
+SKILL_DETAIL_BATCH_SIZE = config('SKILL_DETAIL_BATCH_SIZE', default=2000, cast=int)
+
+
+@lru_cache(maxsize=1)
+def _get_cached_default_config() -> MatchingAlgorithmConfig:
+    """默认算法配置，进程内缓存
+
+    每次实例化IntelligentMatcher都get_or_create一遍默认配置，
+    等于每个匹配入口白付一次数据库往返；配置几乎不变，缓存住。
+    """
+    config, _created = MatchingAlgorithmConfig.objects.get_or_create(
+        name='default',
+        defaults={
+            'description': '默认匹配算法配置',
+            'skill_weight': 0.4,
+            'experience_weight': 0.3,
+            'education_weight': 0.2,
+            'location_weight': 0.1,
+            'is_active': True
+        }
+    )
+    return _attach_weights_vector(config)
+
+
+# 配置版本键：进程内LRU按(id, 版本)做键，版本键本身只缓存60秒，
+# 配置被编辑后最迟一分钟内所有进程都换到新版本；本进程由
+# post_save信号（matching/signals.py）即时清掉
+ALGORITHM_CONFIG_VERSION_KEY = 'algo_cfg_ver:%d'
+ALGORITHM_CONFIG_VERSION_TTL = 60
+
+
+def _attach_weights_vector(config: MatchingAlgorithmConfig) -> MatchingAlgorithmConfig:
+    """预计算权重向量挂在配置实例上，批量matmul路径直接复用"""
+    config.weights_vector = np.array([
+        config.skill_weight,
+        config.experience_weight,
+        config.education_weight,
+        config.location_weight,
+    ], dtype=np.float64)
+    return config
+
+
+@lru_cache(maxsize=32)
+def _load_config(pk: int, version: str) -> MatchingAlgorithmConfig:
+    """按(id, 版本)加载算法配置，进程内LRU缓存"""
+    return _attach_weights_vector(MatchingAlgorithmConfig.objects.get(pk=pk))
+
+
+def get_algorithm_config(pk: int) -> MatchingAlgorithmConfig:
+    """取指定算法配置
+
+    配置两次编辑之间是不变的，逐学生/逐职位回表读取纯属浪费。
+    先从缓存拿版本号（60秒TTL，未命中补一条只取version的查询），
+    再以(id, 版本)命中进程内LRU；版本一变旧缓存项自然失效。
+    """
+    version = cache.get_or_set(
+        ALGORITHM_CONFIG_VERSION_KEY % pk,
+        lambda: MatchingAlgorithmConfig.objects.values_list(
+            'version', flat=True).get(pk=pk),
+        ALGORITHM_CONFIG_VERSION_TTL
+    )
+    return _load_config(pk, version)
+
+
+# 技能权重表：枚举值编码成下标后用NumPy查找表取权重，
+# 向量化路径整列gather；标量路径继续用等价的字典视图
+_PROFICIENCY_LEVELS = ('beginner', 'intermediate', 'advanced', 'expert')
+_PROFICIENCY_W = np.array([0.3, 0.6, 0.8, 1.0])
+_PROFICIENCY_INDEX = {name: i for i, name in enumerate(_PROFICIENCY_LEVELS)}
+
+_IMPORTANCE_LEVELS = ('nice_to_have', 'important', 'critical')
+_IMPORTANCE_W = np.array([1.0, 2.0, 3.0])
+_IMPORTANCE_INDEX = {name: i for i, name in enumerate(_IMPORTANCE_LEVELS)}
+
 
 class SkillMatcher:
     """技能匹配器"""
-    
+
     def __init__(self):
-        self.proficiency_weights = {
-            'beginner': 0.3,
-            'intermediate': 0.6,
-            'advanced': 0.8,
-            'expert': 1.0
-        }
-        
-        self.importance_weights = {
-            'critical': 3.0,
-            'important': 2.0,
-            'nice_to_have': 1.0
-        }
+        self.proficiency_weights = dict(zip(_PROFICIENCY_LEVELS, _PROFICIENCY_W.tolist()))
+        self.importance_weights = dict(zip(_IMPORTANCE_LEVELS, _IMPORTANCE_W.tolist()))
     
     def calculate_skill_match(self, student: StudentProfile, job: Job) -> Dict:
-        """计算技能匹配度"""
+        """计算技能匹配度（单对路径）
+
+        用.all()读取关联集合，这样入口处prefetch_related预取的
+        结果能直接命中缓存；此前的.select_related('skill')会构造
+        新查询集，绕开预取缓存每对重新查询。
+        """
         # 获取学生技能
         student_skills = {
             skill.skill.name: {
                 'proficiency': skill.proficiency_level,
                 'experience': float(skill.years_of_experience)
             }
-            for skill in student.studentskill_set.select_related('skill').all()
+            for skill in student.studentskill_set.all()
         }
-        
+
         # 获取职位必需技能
         required_skills = {
             req.skill.name: {
@@ -53,17 +136,137 @@ class SkillMatcher:
                 'min_experience': float(req.min_experience_years),
                 'weight': req.weight
             }
-            for req in job.jobskillrequirement_set.select_related('skill').all()
+            for req in job.jobskillrequirement_set.all()
         }
-        
+
         # 获取职位偏好技能
         preferred_skills = {
             pref.skill.name: {
                 'bonus_points': pref.bonus_points
             }
-            for pref in job.jobskillpreference_set.select_related('skill').all()
+            for pref in job.jobskillpreference_set.all()
         }
-        
+
+        return self.calculate_skill_match_from_data(
+            student_skills, required_skills, preferred_skills
+        )
+
+    @staticmethod
+    def required_skill_counts(jobs: List[Job]) -> Dict[int, int]:
+        """各职位的必需技能数，一条聚合查询取齐
+
+        只需要数量、不需要具体技能行的调用方（统计、列表展示）
+        走这条路径；批量匹配已整批载入技能行，数量直接取字典
+        长度，不再发这条查询。
+        """
+        counts = {job.id: 0 for job in jobs}
+        counts.update(
+            JobSkillRequirement.objects.filter(job__in=jobs)
+            .values_list('job_id')
+            .annotate(n=Count('id'))
+        )
+        return counts
+
+    def batch_skill_scores(self, students: List[StudentProfile], jobs: List[Job],
+                           student_skills_by_id: Dict[int, Dict],
+                           job_required_by_id: Dict[int, Dict],
+                           job_preferred_by_id: Dict[int, Dict]) -> np.ndarray:
+        """整批计算技能匹配分数矩阵 (len(students) × len(jobs))
+
+        把技能编码成列下标后，每个职位对全体学生的打分是一组
+        元素级数组运算，熟练度/经验/权重的乘加在C层一次完成；
+        逐对的Python循环只在命中配对时才需要补算明细。
+        """
+        skill_index: Dict[str, int] = {}
+        for skills in student_skills_by_id.values():
+            for name in skills:
+                skill_index.setdefault(name, len(skill_index))
+        for required in job_required_by_id.values():
+            for name in required:
+                skill_index.setdefault(name, len(skill_index))
+        for preferred in job_preferred_by_id.values():
+            for name in preferred:
+                skill_index.setdefault(name, len(skill_index))
+
+        n_students, n_jobs, n_skills = len(students), len(jobs), len(skill_index)
+        scores = np.zeros((n_students, n_jobs))
+        if not n_skills:
+            return scores
+
+        # 学生侧矩阵：熟练度权重、经验年数、持有掩码。
+        # 熟练度先编码成下标，权重整列从查找表gather
+        prof = np.zeros((n_students, n_skills))
+        exp = np.zeros((n_students, n_skills))
+        has = np.zeros((n_students, n_skills), dtype=bool)
+        for i, student in enumerate(students):
+            skills = student_skills_by_id.get(student.id, {})
+            if not skills:
+                continue
+            cols = np.fromiter((skill_index[name] for name in skills),
+                               dtype=np.intp, count=len(skills))
+            prof_idx = np.fromiter(
+                (_PROFICIENCY_INDEX[info['proficiency']] for info in skills.values()),
+                dtype=np.intp, count=len(skills))
+            prof[i, cols] = _PROFICIENCY_W[prof_idx]
+            exp[i, cols] = np.fromiter(
+                (info['experience'] for info in skills.values()),
+                dtype=np.float64, count=len(skills))
+            has[i, cols] = True
+
+        # 熟练度百分制只依赖学生侧，提到职位循环外一次算好，
+        # 循环内对必需/加分两条路径都直接切列复用
+        prof100 = prof * 100.0
+
+        for j, job in enumerate(jobs):
+            required = job_required_by_id.get(job.id, {})
+            preferred = job_preferred_by_id.get(job.id, {})
+
+            if required:
+                cols = np.fromiter((skill_index[name] for name in required),
+                                   dtype=np.intp, count=len(required))
+                imp_idx = np.fromiter(
+                    (_IMPORTANCE_INDEX[info['importance']] for info in required.values()),
+                    dtype=np.intp, count=len(required))
+                imp_w = _IMPORTANCE_W[imp_idx] * np.fromiter(
+                    (info['weight'] for info in required.values()),
+                    dtype=np.float64, count=len(required))
+                min_exp = np.fromiter(
+                    (max(info['min_experience'], 1) for info in required.values()),
+                    dtype=np.float64, count=len(required))
+
+                # (熟练度*0.6 + 经验*0.4) * 重要性权重，整列学生一次算完
+                exp_score = np.minimum(exp[:, cols] / min_exp, 1.0) * 100.0
+                per_skill = (prof100[:, cols] * 0.6 + exp_score * 0.4) * imp_w
+                total = np.where(has[:, cols], per_skill, 0.0).sum(axis=1)
+                max_possible = (imp_w * 100.0).sum()
+            else:
+                total = np.zeros(n_students)
+                max_possible = 0.0
+
+            if preferred:
+                pref_names = [name for name in preferred if name not in required]
+                if pref_names:
+                    cols = np.fromiter((skill_index[name] for name in pref_names),
+                                       dtype=np.intp, count=len(pref_names))
+                    bonus = np.fromiter(
+                        (preferred[name]['bonus_points'] for name in pref_names),
+                        dtype=np.float64, count=len(pref_names))
+                    total = total + np.where(
+                        has[:, cols], prof100[:, cols] * bonus, 0.0).sum(axis=1)
+
+            if max_possible > 0:
+                scores[:, j] = np.minimum(total / max_possible * 100.0, 100.0)
+
+        return scores
+
+    def calculate_skill_match_from_data(self, student_skills: Dict,
+                                        required_skills: Dict,
+                                        preferred_skills: Dict) -> Dict:
+        """在已载入内存的技能字典上计算匹配度
+
+        批量匹配预先一次性载入全部技能数据后复用此方法，
+        配对循环内不再触发任何数据库查询。
+        """
         # 计算匹配分数
         total_score = 0.0
         max_possible_score = 0.0
@@ -170,13 +373,68 @@ class SkillMatcher:
         }
 
 
+class TextSkillMatcher:
+    """文本技能匹配器
+
+    精确名称匹配会漏掉"React"与"ReactJS"这类写法差异，
+    这里提供一条可选的TF-IDF文本路径：学生技能拼成技能袋
+    文本，与职位文本一起向量化后整批相似度用一次稀疏矩阵
+    乘法算完。norm='l2'下点积就是余弦相似度，不必逐对调用
+    cosine_similarity反复重新归一化。
+    """
+
+    @staticmethod
+    def student_text(student_skills: Dict) -> str:
+        """学生技能袋文本：技能名拼接"""
+        return ' '.join(student_skills)
+
+    @staticmethod
+    def job_text(job: Job) -> str:
+        """职位文本：标题、描述与要求拼接"""
+        return ' '.join(filter(None, (job.title, job.description, job.requirements)))
+
+    def batch_text_scores(self, student_texts: List[str],
+                          job_texts: List[str]) -> np.ndarray:
+        """整批计算文本相似度矩阵 (len(student_texts) × len(job_texts))
+
+        学生与职位文本合成一个语料一次拟合，之后切分两个
+        稀疏矩阵做单次matmul得到全部配对的余弦相似度。
+        """
+        n_students = len(student_texts)
+        scores = np.zeros((n_students, len(job_texts)))
+        if not n_students or not job_texts:
+            return scores
+
+        docs = list(student_texts) + list(job_texts)
+        try:
+            matrix = TfidfVectorizer(
+                sublinear_tf=True, ngram_range=(1, 2),
+                norm='l2', min_df=2).fit_transform(docs)
+        except ValueError:
+            # 语料太小时min_df=2会把词表剪空，退回不做低频剪枝
+            try:
+                matrix = TfidfVectorizer(
+                    sublinear_tf=True, ngram_range=(1, 2),
+                    norm='l2').fit_transform(docs)
+            except ValueError:
+                return scores
+
+        student_matrix = matrix[:n_students]
+        job_matrix = matrix[n_students:]
+        return (student_matrix @ job_matrix.T).toarray() * 100.0
+
+    def text_score(self, student_skills: Dict, job: Job) -> float:
+        """单对文本相似度分数（0-100）"""
+        return float(self.batch_text_scores(
+            [self.student_text(student_skills)], [self.job_text(job)])[0, 0])
+
+
 class ExperienceMatcher:
     """经验匹配器"""
-    
-    def calculate_experience_match(self, student: StudentProfile, job: Job) -> float:
-        """计算经验匹配度"""
+
+    def __init__(self):
         # 经验等级映射
-        experience_levels = {
+        self.experience_levels = {
             'entry': 0,
             'junior': 1,
             'mid': 3,
@@ -184,17 +442,47 @@ class ExperienceMatcher:
             'lead': 8,
             'executive': 10
         }
-        
+
+    def calculate_experience_match(self, student: StudentProfile, job: Job) -> float:
+        """计算经验匹配度
+
+        技能集合已被prefetch_related预取时直接在缓存上求均值，
+        不发查询；未预取时用Avg()聚合在数据库算，只回传一行，
+        不再整批取回技能行在Python里转型累加。
+        """
         # 学生总经验年数（基于技能经验的平均值）
-        student_skills = student.studentskill_set.all()
-        if student_skills:
-            avg_experience = sum(float(skill.years_of_experience) for skill in student_skills) / len(student_skills)
+        prefetched = getattr(student, '_prefetched_objects_cache', None)
+        if prefetched is not None and 'studentskill_set' in prefetched:
+            student_skills = prefetched['studentskill_set']
+            if student_skills:
+                avg_experience = sum(
+                    float(skill.years_of_experience) for skill in student_skills
+                ) / len(student_skills)
+            else:
+                avg_experience = 0.0
         else:
-            avg_experience = 0.0
-        
+            avg_experience = float(
+                student.studentskill_set.aggregate(
+                    avg=Avg('years_of_experience'))['avg'] or 0.0)
+
+        return self.score_from_average(avg_experience, job.experience_level)
+
+    def score_from_average(self, avg_experience: float, experience_level: str) -> float:
+        """由预先算好的平均经验年数打分
+
+        经验分数只依赖学生，批量匹配按学生算一次平均值后
+        对每个职位复用。
+        """
         # 职位要求的经验等级
-        job_experience_level = experience_levels.get(job.experience_level, 0)
-        
+        job_experience_level = self.experience_levels.get(experience_level, 0)
+        return self.score_from_level(avg_experience, job_experience_level)
+
+    def score_from_level(self, avg_experience: float, job_experience_level: int) -> float:
+        """由平均经验年数与已解码的职位经验等级打分
+
+        批量匹配按职位预先解码一次等级整数，内层循环不再
+        重复查等级映射表。
+        """
         # 计算匹配分数
         if avg_experience >= job_experience_level:
             # 经验充足或超出要求
@@ -216,6 +504,21 @@ class ExperienceMatcher:
                 ratio = avg_experience / job_experience_level
                 return max(0.0, ratio * 100.0)
 
+    def batch_scores(self, avg_exp: np.ndarray, job_levels: np.ndarray) -> np.ndarray:
+        """整批经验分数矩阵 (len(avg_exp) × len(job_levels))
+
+        把逐对的if/else级联改写成网格上的np.where掩码选择，
+        全部配对一次算完，无分支。
+        """
+        avg = avg_exp[:, None]
+        levels = job_levels[None, :].astype(np.float64)
+        ratio = avg / np.maximum(levels, 1.0)
+        sufficient = np.where(ratio <= 2.0, 100.0,
+                              np.maximum(85.0, 100.0 - (ratio - 2.0) * 5.0))
+        insufficient = np.clip(ratio, 0.0, 1.0) * 100.0
+        scores = np.where(avg >= levels, sufficient, insufficient)
+        return np.where(levels == 0.0, 100.0, scores)
+
 
 class EducationMatcher:
     """教育背景匹配器"""
@@ -227,14 +530,8 @@ class EducationMatcher:
             'master': 3,
             'phd': 4
         }
-    
-    def calculate_education_match(self, student: StudentProfile, job: Job) -> float:
-        """计算教育背景匹配度"""
-        # 基础教育等级匹配
-        student_level = self.education_levels.get(student.education_level, 0)
-        
         # 由于Job模型中没有直接的教育要求字段，我们基于职位等级推断
-        job_level_requirements = {
+        self.job_level_requirements = {
             'entry': 1,      # 专科及以上
             'junior': 2,     # 本科及以上
             'mid': 2,        # 本科及以上
@@ -242,23 +539,41 @@ class EducationMatcher:
             'lead': 3,       # 硕士优先
             'executive': 3   # 硕士优先
         }
-        
-        required_level = job_level_requirements.get(job.experience_level, 2)
-        
+
+    def calculate_education_match(self, student: StudentProfile, job: Job) -> float:
+        """计算教育背景匹配度"""
+        # 基础教育等级匹配
+        student_level = self.education_levels.get(student.education_level, 0)
+        required_level = self.job_level_requirements.get(job.experience_level, 2)
+
         if student_level >= required_level:
             return 100.0
         else:
             # 教育水平不足时的分数计算
             return max(0.0, (student_level / required_level) * 100.0)
 
+    def batch_scores(self, student_levels: np.ndarray,
+                     required_levels: np.ndarray) -> np.ndarray:
+        """整批教育分数矩阵 (len(student_levels) × len(required_levels))"""
+        s = student_levels[:, None].astype(np.float64)
+        r = required_levels[None, :].astype(np.float64)
+        return np.where(s >= r, 100.0, s / np.maximum(r, 1.0) * 100.0)
+
 
 class LocationMatcher:
     """地理位置匹配器"""
     
-    def calculate_location_match(self, student: StudentProfile, job: Job) -> float:
-        """计算地理位置匹配度"""
+    def calculate_location_match(self, student: StudentProfile, job: Job,
+                                 preferred_locations: Optional[frozenset] = None) -> float:
+        """计算地理位置匹配度
+
+        多次对同一学生打分的调用方可把预先构建的偏好frozenset
+        传进来，命中判定走O(1)哈希查找，免去每对重建集合和
+        列表线性扫描。
+        """
         # 检查学生偏好位置
-        preferred_locations = student.preferred_locations or []
+        if preferred_locations is None:
+            preferred_locations = frozenset(student.preferred_locations or ())
         job_location = job.location_city
         
         # 远程工作选项
@@ -276,6 +591,30 @@ class LocationMatcher:
         # 位置不匹配
         return 20.0
 
+    def batch_scores(self, remote_mask: np.ndarray, preferred_hit: np.ndarray,
+                     no_prefs: np.ndarray) -> np.ndarray:
+        """整批位置分数矩阵
+
+        三个布尔掩码（职位远程、偏好命中、学生无偏好）套三层
+        np.where还原单对路径的判定顺序。
+        """
+        return np.where(remote_mask[None, :], 100.0,
+                        np.where(preferred_hit, 100.0,
+                                 np.where(no_prefs[:, None], 60.0, 20.0)))
+
+
+@dataclass(slots=True)
+class _MatchContext:
+    """传给AI分析的轻量匹配上下文
+
+    鸭子类型兼容AI服务读取的student/job/overall_score三个属性；
+    此前临时构造未保存的MatchResult实例，Model.__init__要走全部
+    字段默认值与描述符赋值，只为传三个值太重。
+    """
+    student: StudentProfile
+    job: Job
+    overall_score: float
+
 
 class IntelligentMatcher:
     """智能匹配引擎"""
@@ -283,24 +622,14 @@ class IntelligentMatcher:
     def __init__(self, config: Optional[MatchingAlgorithmConfig] = None):
         self.config = config or self._get_default_config()
         self.skill_matcher = SkillMatcher()
+        self.text_matcher = TextSkillMatcher()
         self.experience_matcher = ExperienceMatcher()
         self.education_matcher = EducationMatcher()
         self.location_matcher = LocationMatcher()
     
     def _get_default_config(self) -> MatchingAlgorithmConfig:
         """获取默认配置"""
-        config, created = MatchingAlgorithmConfig.objects.get_or_create(
-            name='default',
-            defaults={
-                'description': '默认匹配算法配置',
-                'skill_weight': 0.4,
-                'experience_weight': 0.3,
-                'education_weight': 0.2,
-                'location_weight': 0.1,
-                'is_active': True
-            }
-        )
-        return config
+        return _get_cached_default_config()
     
     def calculate_match(self, student: StudentProfile, job: Job) -> MatchResult:
         """计算学生与职位的匹配度"""
@@ -319,54 +648,132 @@ class IntelligentMatcher:
                 location_score * self.config.location_weight
             )
             
-            # 生成推荐理由
-            recommendation_reasons = self._generate_recommendation_reasons(
-                skill_result, experience_score, education_score, location_score
+            match_result = self._persist_match(
+                student, job, overall_score, skill_result,
+                experience_score, education_score, location_score
             )
-            
-            # 生成改进建议
-            improvement_suggestions = self._generate_improvement_suggestions(skill_result)
-            
-            # 创建或更新匹配结果
-            match_result, created = MatchResult.objects.update_or_create(
-                student=student,
-                job=job,
-                defaults={
-                    'overall_score': round(overall_score, 2),
-                    'skill_match_score': round(skill_result['skill_match_score'], 2),
-                    'experience_match_score': round(experience_score, 2),
-                    'education_match_score': round(education_score, 2),
-                    'location_match_score': round(location_score, 2),
-                    'match_details': {
-                        'total_required_skills': skill_result['total_required_skills'],
-                        'matched_required_skills': skill_result['matched_required_skills'],
-                        'bonus_skills_count': skill_result['bonus_skills_count'],
-                        'missing_skills': skill_result['missing_skills'],
-                        'bonus_skills': skill_result['bonus_skills']
-                    },
-                    'recommendation_reasons': recommendation_reasons,
-                    'improvement_suggestions': improvement_suggestions
-                }
-            )
-            
-            # 使用Google AI增强匹配分析（在创建match_result之后）
-            ai_analysis = self._get_ai_enhanced_analysis(student, job, overall_score, skill_result, match_result)
-            
-            # 更新match_result的AI分析结果
-            match_result.match_details['ai_analysis'] = ai_analysis
-            match_result.save()
-            
-            # 创建技能匹配详情
-            if created or not match_result.skill_details.exists():
-                self._create_skill_details(match_result, skill_result['skill_details'])
-            
+
             logger.info(f"匹配计算完成: {student.user.username} -> {job.title} = {overall_score:.2f}%")
             return match_result
-            
+
         except Exception as e:
             logger.error(f"匹配计算失败: {student.user.username} -> {job.title}, 错误: {str(e)}")
             raise
-    
+
+    def _persist_match(self, student: StudentProfile, job: Job, overall_score: float,
+                       skill_result: Dict, experience_score: float,
+                       education_score: float, location_score: float,
+                       enable_ai: bool = True) -> MatchResult:
+        """生成理由/建议并写入匹配结果，单对与批量路径共用
+
+        AI分析在写库前算好并放进match_details，一次update_or_create
+        落库；此前先写一遍再补AI字段重新save，每对多一条UPDATE。
+        批量路径传enable_ai=False跳过逐对的AI网络调用。
+        """
+        # 生成推荐理由
+        recommendation_reasons = self._generate_recommendation_reasons(
+            skill_result, experience_score, education_score, location_score
+        )
+
+        # 生成改进建议
+        improvement_suggestions = self._generate_improvement_suggestions(skill_result)
+
+        # 使用Google AI增强匹配分析（批量时跳过）
+        if enable_ai:
+            ai_analysis = self._get_ai_enhanced_analysis(student, job, overall_score, skill_result)
+        else:
+            ai_analysis = {}
+
+        # 创建或更新匹配结果
+        match_result, created = MatchResult.objects.update_or_create(
+            student=student,
+            job=job,
+            defaults=self._match_defaults(
+                overall_score, skill_result, experience_score,
+                education_score, location_score, ai_analysis,
+                recommendation_reasons, improvement_suggestions
+            )
+        )
+
+        # 创建技能匹配详情
+        if created or not match_result.skill_details.exists():
+            self._create_skill_details(match_result, skill_result['skill_details'])
+
+        return match_result
+
+    def _match_defaults(self, overall_score: float, skill_result: Dict,
+                        experience_score: float, education_score: float,
+                        location_score: float, ai_analysis: Dict,
+                        recommendation_reasons: List[str],
+                        improvement_suggestions: List[str]) -> Dict:
+        """匹配结果的落库字段，单对upsert与批量bulk_create共用"""
+        return {
+            'overall_score': round(overall_score, 2),
+            'match_level': MatchResult.level_for_score(overall_score),
+            'skill_match_score': round(skill_result['skill_match_score'], 2),
+            'experience_match_score': round(experience_score, 2),
+            'education_match_score': round(education_score, 2),
+            'location_match_score': round(location_score, 2),
+            # 缺失/加分技能明细不再冗余进JSON：SkillMatchDetail表
+            # 已按行存了同样的数据（is_missing_skill/is_bonus_skill），
+            # 这里只留汇总计数和AI分析，匹配结果行体积明显变小
+            'match_details': {
+                'total_required_skills': skill_result['total_required_skills'],
+                'matched_required_skills': skill_result['matched_required_skills'],
+                'bonus_skills_count': skill_result['bonus_skills_count'],
+                'ai_analysis': ai_analysis
+            },
+            'recommendation_reasons': recommendation_reasons,
+            'improvement_suggestions': improvement_suggestions
+        }
+
+    def _bulk_persist(self, pending: List[Tuple[MatchResult, List[Dict]]]) -> List[MatchResult]:
+        """整批落库匹配结果及技能明细
+
+        update_or_create每对要SELECT加UPDATE/INSERT两条查询，
+        N个命中配对就是2N条往返；这里一次bulk_create走
+        INSERT ... ON CONFLICT DO UPDATE整批写入。冲突更新路径
+        下部分Django版本不回填主键，补一条查询取回id后整批
+        重建技能明细。
+        """
+        if not pending:
+            return []
+
+        rows = [row for row, _details in pending]
+        MatchResult.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['student', 'job'],
+            update_fields=[
+                'overall_score', 'match_level', 'skill_match_score',
+                'experience_match_score', 'education_match_score',
+                'location_match_score', 'match_details',
+                'recommendation_reasons', 'improvement_suggestions',
+            ],
+            batch_size=MATCH_BULK_BATCH_SIZE,
+        )
+
+        id_map = {
+            (student_id, job_id): pk
+            for pk, student_id, job_id in MatchResult.objects.filter(
+                student_id__in={row.student_id for row in rows},
+                job_id__in={row.job_id for row in rows},
+            ).values_list('id', 'student_id', 'job_id')
+        }
+
+        detail_objects = []
+        for row, details in pending:
+            row.pk = id_map[(row.student_id, row.job_id)]
+            for detail in details:
+                detail_objects.append(
+                    SkillMatchDetail(match_result_id=row.pk, **detail))
+
+        SkillMatchDetail.objects.filter(
+            match_result_id__in=[row.pk for row in rows]).delete()
+        SkillMatchDetail.objects.bulk_create(
+            detail_objects, batch_size=SKILL_DETAIL_BATCH_SIZE)
+        return rows
+
     def _create_skill_details(self, match_result: MatchResult, skill_details: List[Dict]):
         """创建技能匹配详情记录"""
         # 删除旧的详情记录
@@ -382,7 +789,8 @@ class IntelligentMatcher:
                 )
             )
         
-        SkillMatchDetail.objects.bulk_create(skill_detail_objects)
+        SkillMatchDetail.objects.bulk_create(
+            skill_detail_objects, batch_size=SKILL_DETAIL_BATCH_SIZE)
     
     def _generate_recommendation_reasons(self, skill_result: Dict, experience_score: float, 
                                        education_score: float, location_score: float) -> List[str]:
@@ -420,19 +828,25 @@ class IntelligentMatcher:
         """生成改进建议"""
         suggestions = []
         
-        # 基于缺失技能的建议
+        # 基于缺失技能的建议：一趟扫描按重要性分桶，
+        # 每桶只保留建议里用得到的前3个技能名
         missing_skills = skill_result['missing_skills']
         if missing_skills:
-            critical_missing = [s for s in missing_skills if s['importance'] == 'critical']
-            important_missing = [s for s in missing_skills if s['importance'] == 'important']
-            
+            critical_missing = []
+            important_missing = []
+            for skill in missing_skills:
+                if skill['importance'] == 'critical':
+                    if len(critical_missing) < 3:
+                        critical_missing.append(skill['skill_name'])
+                elif skill['importance'] == 'important':
+                    if len(important_missing) < 3:
+                        important_missing.append(skill['skill_name'])
+
             if critical_missing:
-                skills_list = ', '.join([s['skill_name'] for s in critical_missing[:3]])
-                suggestions.append(f"建议重点学习关键技能: {skills_list}")
-            
+                suggestions.append(f"建议重点学习关键技能: {', '.join(critical_missing)}")
+
             if important_missing:
-                skills_list = ', '.join([s['skill_name'] for s in important_missing[:3]])
-                suggestions.append(f"建议补充重要技能: {skills_list}")
+                suggestions.append(f"建议补充重要技能: {', '.join(important_missing)}")
         
         # 基于匹配分数的建议
         if skill_result['skill_match_score'] < 60:
@@ -440,51 +854,226 @@ class IntelligentMatcher:
         
         return suggestions
     
-    def batch_match(self, students: List[StudentProfile], jobs: List[Job], 
+    def batch_match(self, students: List[StudentProfile], jobs: List[Job],
                    min_score: float = 60.0) -> List[MatchResult]:
-        """批量匹配"""
-        results = []
+        """批量匹配
+
+        技能数据在循环前用三条查询整批载入内存，配对循环只在
+        预构建的字典上计算；原实现每个配对都重新查询学生技能、
+        职位必需/偏好技能，S×J规模下数据库往返数随配对数成倍
+        增长。低于min_score的配对不再写库；命中配对先积累成
+        未保存对象，循环结束后一次bulk_create整批落库。
+        """
+        pending: List[Tuple[MatchResult, List[Dict]]] = []
         total_combinations = len(students) * len(jobs)
         processed = 0
-        
+
         logger.info(f"开始批量匹配: {len(students)} 名学生 × {len(jobs)} 个职位")
-        
-        for student in students:
-            for job in jobs:
+
+        # 一次性载入参与配对的全部技能数据，按id索引
+        student_skills_by_id: Dict[int, Dict] = defaultdict(dict)
+        for row in StudentSkill.objects.filter(student__in=students).values(
+                'student_id', 'skill__name', 'proficiency_level', 'years_of_experience'):
+            student_skills_by_id[row['student_id']][row['skill__name']] = {
+                'proficiency': row['proficiency_level'],
+                'experience': float(row['years_of_experience'])
+            }
+
+        job_required_by_id: Dict[int, Dict] = defaultdict(dict)
+        for row in JobSkillRequirement.objects.filter(job__in=jobs).values(
+                'job_id', 'skill__name', 'importance', 'min_experience_years', 'weight'):
+            job_required_by_id[row['job_id']][row['skill__name']] = {
+                'importance': row['importance'],
+                'min_experience': float(row['min_experience_years']),
+                'weight': row['weight']
+            }
+
+        job_preferred_by_id: Dict[int, Dict] = defaultdict(dict)
+        for row in JobSkillPreference.objects.filter(job__in=jobs).values(
+                'job_id', 'skill__name', 'bonus_points'):
+            job_preferred_by_id[row['job_id']][row['skill__name']] = {
+                'bonus_points': row['bonus_points']
+            }
+
+        # 职位经验等级按职位预先解码成整数
+        job_levels = [
+            self.experience_matcher.experience_levels.get(job.experience_level, 0)
+            for job in jobs
+        ]
+
+        # 经验分数只依赖学生，平均年限按学生预先算一次；
+        # 技能数据上面已整批在内存，直接一趟求均值，
+        # 不必再发一条Avg聚合查询
+        avg_exp_by_student = {
+            student.id: (
+                sum(s['experience'] for s in skills.values()) / len(skills)
+                if (skills := student_skills_by_id.get(student.id)) else 0.0
+            )
+            for student in students
+        }
+
+        # 四个维度分数全部整批向量化成 S×J 网格；
+        # 逐对的Python代码只剩命中配对的明细补算与落库
+        skill_scores = self.skill_matcher.batch_skill_scores(
+            students, jobs, student_skills_by_id,
+            job_required_by_id, job_preferred_by_id)
+
+        avg_exp_arr = np.fromiter(
+            (avg_exp_by_student[student.id] for student in students),
+            dtype=np.float64, count=len(students))
+        job_level_arr = np.fromiter(job_levels, dtype=np.float64, count=len(jobs))
+        experience_scores = self.experience_matcher.batch_scores(
+            avg_exp_arr, job_level_arr)
+
+        student_edu = np.fromiter(
+            (self.education_matcher.education_levels.get(s.education_level, 0)
+             for s in students), dtype=np.float64, count=len(students))
+        job_edu_req = np.fromiter(
+            (self.education_matcher.job_level_requirements.get(job.experience_level, 2)
+             for job in jobs), dtype=np.float64, count=len(jobs))
+        education_scores = self.education_matcher.batch_scores(student_edu, job_edu_req)
+
+        prefs_by_student = [frozenset(s.preferred_locations or ()) for s in students]
+        remote_mask = np.fromiter(
+            (job.remote_option in ('remote', 'hybrid') for job in jobs),
+            dtype=bool, count=len(jobs))
+        # 城市编码成列下标后，偏好命中是 学生×城市 独热矩阵按
+        # 职位城市列的一次gather，省掉S×J的逐对成员判定
+        city_index: Dict[str, int] = {}
+        job_city_idx = np.fromiter(
+            (city_index.setdefault(job.location_city, len(city_index))
+             for job in jobs), dtype=np.intp, count=len(jobs))
+        pref_matrix = np.zeros((len(students), len(city_index)), dtype=bool)
+        for i, prefs in enumerate(prefs_by_student):
+            for city in prefs:
+                col = city_index.get(city)
+                if col is not None:
+                    pref_matrix[i, col] = True
+        preferred_hit = pref_matrix[:, job_city_idx]
+        no_prefs = np.fromiter((not prefs for prefs in prefs_by_student),
+                               dtype=bool, count=len(students))
+        location_scores = self.location_matcher.batch_scores(
+            remote_mask, preferred_hit, no_prefs)
+
+        # 加权总分整批算：四个维度网格堆成 (S, J, 4) 分量张量，
+        # 与权重向量一次matmul得到总分矩阵，逐对的乘加全部消掉；
+        # 过线判定也在网格上用布尔掩码一次完成
+        weights = getattr(self.config, 'weights_vector', None)
+        if weights is None:
+            weights = np.array([
+                self.config.skill_weight,
+                self.config.experience_weight,
+                self.config.education_weight,
+                self.config.location_weight,
+            ], dtype=np.float64)
+        overall_scores = np.stack(
+            [skill_scores, experience_scores, education_scores, location_scores],
+            axis=-1) @ weights
+        np.round(overall_scores, 2, out=overall_scores)
+        passing_mask = overall_scores >= min_score
+        skipped = total_combinations - int(passing_mask.sum())
+        if skipped:
+            logger.info(f"批量匹配剪枝: {skipped}/{total_combinations} 个配对未达阈值，跳过")
+
+        # 职位技能字典按列下标预先取好，命中循环里不再按id查字典
+        required_by_col = [job_required_by_id.get(job.id, {}) for job in jobs]
+        preferred_by_col = [job_preferred_by_id.get(job.id, {}) for job in jobs]
+
+        for i, student in enumerate(students):
+            student_skills = student_skills_by_id.get(student.id, {})
+
+            for j in np.nonzero(passing_mask[i])[0]:
+                job = jobs[j]
                 try:
-                    match_result = self.calculate_match(student, job)
-                    if match_result.overall_score >= min_score:
-                        results.append(match_result)
-                    
+                    overall_score = float(overall_scores[i, j])
+                    skill_score = float(skill_scores[i, j])
+                    experience_score = float(experience_scores[i, j])
+                    education_score = float(education_scores[i, j])
+                    location_score = float(location_scores[i, j])
+
                     processed += 1
                     if processed % 100 == 0:
                         logger.info(f"批量匹配进度: {processed}/{total_combinations}")
-                        
+
+                    skill_result = self.skill_matcher.calculate_skill_match_from_data(
+                        student_skills,
+                        required_by_col[j],
+                        preferred_by_col[j]
+                    )
+                    pending.append((
+                        MatchResult(
+                            student=student, job=job,
+                            **self._match_defaults(
+                                overall_score, skill_result,
+                                experience_score, education_score, location_score,
+                                ai_analysis={},
+                                recommendation_reasons=self._generate_recommendation_reasons(
+                                    skill_result, experience_score,
+                                    education_score, location_score),
+                                improvement_suggestions=self._generate_improvement_suggestions(
+                                    skill_result),
+                            )
+                        ),
+                        skill_result['skill_details'],
+                    ))
+
                 except Exception as e:
                     logger.error(f"批量匹配失败: {student.user.username} -> {job.title}, 错误: {str(e)}")
                     continue
-        
+
+        results = self._bulk_persist(pending)
         logger.info(f"批量匹配完成: 生成 {len(results)} 个有效匹配结果")
         return results
     
     def _get_ai_enhanced_analysis(self, student: StudentProfile, job: Job, overall_score: float, skill_result: dict, match_result: MatchResult = None) -> dict:
-        """使用Google AI增强匹配分析"""
+        """使用Google AI增强匹配分析
+
+        复用模块级的google_ai_service单例；每次构造GoogleAIService
+        会重新读配置、初始化SDK并打日志。服务未启用时直接返回
+        降级结果，不进入try/except路径。
+
+        AI调用是整条匹配链路里唯一的网络RPC，结果按
+        (学生, 职位, 数据指纹)缓存一天：指纹取自技能匹配摘要，
+        学生技能或职位要求变动后分数/缺失技能随之变化，
+        自动换键重新请求。降级结果不写缓存，避免把一次
+        临时故障固化一整天。
+        """
+        if not google_ai_service.is_enabled:
+            return {
+                'compatibility_analysis': '暂时无法获取AI分析',
+                'strengths': [],
+                'concerns': [],
+                'skill_recommendations': [],
+                'career_advice': '',
+                'confidence_score': 0.0
+            }
+
+        data_hash = hashlib.md5(json.dumps({
+            'score': round(overall_score, 2),
+            'skill_score': round(skill_result['skill_match_score'], 2),
+            'matched': skill_result['matched_required_skills'],
+            'total': skill_result['total_required_skills'],
+            'missing': sorted(s['skill_name'] for s in skill_result['missing_skills']),
+            'bonus': sorted(s['skill_name'] for s in skill_result['bonus_skills']),
+        }, sort_keys=True).encode()).hexdigest()
+        cache_key = AI_ANALYSIS_CACHE_KEY % (student.id, job.id, data_hash)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            from .google_ai_service import GoogleAIService
-            ai_service = GoogleAIService()
-            
-            # 如果没有传入match_result，创建一个临时的用于AI分析
+            # 如果没有传入match_result，构造轻量上下文用于AI分析
             if match_result is None:
-                match_result = MatchResult(
+                match_result = _MatchContext(
                     student=student,
                     job=job,
                     overall_score=overall_score
                 )
-            
+
             # 获取AI分析
-            ai_analysis = ai_service.analyze_match_compatibility(student, job, match_result)
-            
-            return {
+            ai_analysis = google_ai_service.analyze_match_compatibility(student, job, match_result)
+
+            result = {
                 'compatibility_analysis': ai_analysis.get('compatibility_analysis', ''),
                 'strengths': ai_analysis.get('strengths', []),
                 'concerns': ai_analysis.get('concerns', []),
@@ -492,6 +1081,8 @@ class IntelligentMatcher:
                 'career_advice': ai_analysis.get('career_advice', ''),
                 'confidence_score': ai_analysis.get('confidence_score', 0.8)
             }
+            cache.set(cache_key, result, AI_ANALYSIS_CACHE_TTL)
+            return result
         except Exception as e:
             logger.warning(f"AI分析失败: {str(e)}")
             return {
@@ -503,16 +1094,61 @@ class IntelligentMatcher:
                 'confidence_score': 0.0
             }
     
+    # 技能明细预取时只取序列化用得到的列；match_result外键必须
+    # 保留，预取靠它把明细挂回各自的匹配结果
+    _SKILL_DETAIL_PREFETCH = Prefetch(
+        'skill_details',
+        queryset=SkillMatchDetail.objects.only(
+            'match_result', 'skill_name', 'match_score',
+            'is_missing_skill', 'is_bonus_skill'))
+
     def get_top_matches_for_student(self, student: StudentProfile, limit: int = 10) -> List[MatchResult]:
-        """获取学生的最佳职位匹配"""
+        """获取学生的最佳职位匹配
+
+        技能明细随主查询一并预取，序列化时逐条访问
+        skill_details不再每行补一条查询。
+        """
         return MatchResult.objects.filter(
             student=student,
             is_active=True
-        ).select_related('job', 'job__employer').order_by('-overall_score')[:limit]
-    
+        ).select_related('job', 'job__employer').prefetch_related(
+            self._SKILL_DETAIL_PREFETCH
+        ).order_by('-overall_score')[:limit]
+
+    def get_top_matches_for_student_values(self, student: StudentProfile,
+                                           limit: int = 10) -> List[Dict]:
+        """学生最佳匹配的轻量字典视图
+
+        只需要标量分数和展示字段的调用方走这条路径，
+        跳过模型实例化直接取values()字典。
+        """
+        return list(MatchResult.objects.filter(
+            student=student,
+            is_active=True
+        ).order_by('-overall_score').values(
+            'id', 'job_id', 'job__title', 'job__location_city',
+            'job__employer__company_name', 'overall_score',
+            'skill_match_score', 'experience_match_score',
+            'education_match_score', 'location_match_score'
+        )[:limit])
+
     def get_top_matches_for_job(self, job: Job, limit: int = 10) -> List[MatchResult]:
         """获取职位的最佳学生匹配"""
         return MatchResult.objects.filter(
             job=job,
             is_active=True
-        ).select_related('student', 'student__user').order_by('-overall_score')[:limit]
\ No newline at end of file
+        ).select_related('student', 'student__user').prefetch_related(
+            self._SKILL_DETAIL_PREFETCH
+        ).order_by('-overall_score')[:limit]
+
+    def get_top_matches_for_job_values(self, job: Job, limit: int = 10) -> List[Dict]:
+        """职位最佳匹配的轻量字典视图"""
+        return list(MatchResult.objects.filter(
+            job=job,
+            is_active=True
+        ).order_by('-overall_score').values(
+            'id', 'student_id', 'student__user__username',
+            'student__university', 'student__major', 'overall_score',
+            'skill_match_score', 'experience_match_score',
+            'education_match_score', 'location_match_score'
+        )[:limit])
\ No newline at end of file
@@ -6,6 +6,8 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
+from django.db import DatabaseError
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from resumes.models import Resume
 from jobs.models import Job
@@ -14,6 +16,81 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# 独立RNG实例：不与全局random共享状态，也不受别处seed()影响
+_rng = random.Random()
+
+# 按分数档预构建的静态分析文案：内容不随请求变化，模块加载时
+# 构建一次，视图里按阈值选档直接引用，不再每个请求重建几十个
+# 字符串对象。detailed_analysis留{name}/{title}占位符按请求填充。
+_TEMPLATES = {
+    'high': {
+        'detailed_analysis': (
+            "Candidate {name} is highly compatible with the {title} position. "
+            "The candidate's skill background aligns very well with the job requirements, "
+            "and their educational background and work experience meet the position needs."
+        ),
+        'strengths': [
+            "Extremely high skill match, core skills fully meet position requirements",
+            "Educational background highly matches position requirements",
+            "Rich work experience with relevant industry background",
+            "Excellent overall quality with great development potential"
+        ],
+        'weaknesses': [
+            "Could further improve some auxiliary skills",
+            "Recommend adding more relevant project experience"
+        ],
+        'recommendations': [
+            "Strongly recommend proceeding to interview stage",
+            "Consider offering competitive salary package",
+            "Recommend arranging technical interview to verify core skills"
+        ],
+    },
+    'mid': {
+        'detailed_analysis': (
+            "Candidate {name} is moderately compatible with the {title} position. "
+            "The candidate has basic skill requirements but has room for improvement in some areas."
+        ),
+        'strengths': [
+            "Solid basic skills, meets basic position requirements",
+            "Strong learning ability and good adaptability",
+            "Positive work attitude with some experience accumulation"
+        ],
+        'weaknesses': [
+            "Some core skills need further strengthening",
+            "Relatively limited relevant project experience",
+            "Certain professional skills need improvement"
+        ],
+        'recommendations': [
+            "Recommend conducting skill assessment interview",
+            "Consider providing training opportunities",
+            "Suitable as backup candidate"
+        ],
+    },
+    'low': {
+        'detailed_analysis': (
+            "Candidate {name} has average compatibility with the {title} position. "
+            "The candidate has some foundation but there is still a significant gap "
+            "with the position requirements."
+        ),
+        'strengths': [
+            "Has basic professional qualities",
+            "Shows willingness to learn and development potential",
+            "Positive attitude and proactive work approach"
+        ],
+        'weaknesses': [
+            "Significant gap between core skills and position requirements",
+            "Insufficient relevant work experience",
+            "Professional skills need substantial improvement",
+            "Educational background doesn't match position requirements well"
+        ],
+        'recommendations': [
+            "Recommend candidate to improve relevant skills first",
+            "Consider entry-level or training positions",
+            "Requires longer development period"
+        ],
+    },
+}
+
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -35,79 +112,36 @@ def analyze_match(request):
         try:
             resume = get_object_or_404(Resume, id=resume_id)
             job = get_object_or_404(Job, id=job_id)
-        except:
+        except (Resume.DoesNotExist, Job.DoesNotExist, Http404):
             return Response({
                 'error': 'Resume or job position not found'
             }, status=status.HTTP_404_NOT_FOUND)
-        
+
         # 生成模拟的匹配分析结果
-        overall_score = random.randint(60, 95)
-        
-        # 根据分数生成不同的分析内容
+        overall_score = _rng.randint(60, 95)
+
+        # 根据分数选取预构建的分析文案
         if overall_score >= 85:
-            detailed_analysis = f"Candidate {resume.name} is highly compatible with the {job.title} position. The candidate's skill background aligns very well with the job requirements, and their educational background and work experience meet the position needs."
-            strengths = [
-                "Extremely high skill match, core skills fully meet position requirements",
-                "Educational background highly matches position requirements",
-                "Rich work experience with relevant industry background",
-                "Excellent overall quality with great development potential"
-            ]
-            weaknesses = [
-                "Could further improve some auxiliary skills",
-                "Recommend adding more relevant project experience"
-            ]
-            recommendations = [
-                "Strongly recommend proceeding to interview stage",
-                "Consider offering competitive salary package",
-                "Recommend arranging technical interview to verify core skills"
-            ]
+            template = _TEMPLATES['high']
         elif overall_score >= 70:
-            detailed_analysis = f"Candidate {resume.name} is moderately compatible with the {job.title} position. The candidate has basic skill requirements but has room for improvement in some areas."
-            strengths = [
-                "Solid basic skills, meets basic position requirements",
-                "Strong learning ability and good adaptability",
-                "Positive work attitude with some experience accumulation"
-            ]
-            weaknesses = [
-                "Some core skills need further strengthening",
-                "Relatively limited relevant project experience",
-                "Certain professional skills need improvement"
-            ]
-            recommendations = [
-                "Recommend conducting skill assessment interview",
-                "Consider providing training opportunities",
-                "Suitable as backup candidate"
-            ]
+            template = _TEMPLATES['mid']
         else:
-            detailed_analysis = f"Candidate {resume.name} has average compatibility with the {job.title} position. The candidate has some foundation but there is still a significant gap with the position requirements."
-            strengths = [
-                "Has basic professional qualities",
-                "Shows willingness to learn and development potential",
-                "Positive attitude and proactive work approach"
-            ]
-            weaknesses = [
-                "Significant gap between core skills and position requirements",
-                "Insufficient relevant work experience",
-                "Professional skills need substantial improvement",
-                "Educational background doesn't match position requirements well"
-            ]
-            recommendations = [
-                "Recommend candidate to improve relevant skills first",
-                "Consider entry-level or training positions",
-                "Requires longer development period"
-            ]
-        
-        # 构造返回结果
+            template = _TEMPLATES['low']
+
+        # 构造返回结果：列表直接引用常量（只读返回，DRF序列化
+        # 不修改内容），仅detailed_analysis按请求填充占位符
+        skills = resume.skills
         result = {
             'overall_score': overall_score,
-            'detailed_analysis': detailed_analysis,
-            'strengths': strengths,
-            'weaknesses': weaknesses,
-            'recommendations': recommendations,
+            'detailed_analysis': template['detailed_analysis'].format(
+                name=resume.name, title=job.title),
+            'strengths': template['strengths'],
+            'weaknesses': template['weaknesses'],
+            'recommendations': template['recommendations'],
             'resume_info': {
                 'name': resume.name,
                 'email': resume.email,
-                'skills': resume.skills[:100] + '...' if len(resume.skills) > 100 else resume.skills
+                'skills': skills[:100] + '...' if len(skills) > 100 else skills
             },
             'job_info': {
                 'title': job.title,
@@ -121,7 +155,7 @@ def analyze_match(request):
         
         return Response(result, status=status.HTTP_200_OK)
         
-    except Exception as e:
+    except (DatabaseError, ValueError) as e:
         logger.error(f"Error in analyze_match: {str(e)}")
         return Response({
             'error': 'An error occurred during analysis, please try again later'
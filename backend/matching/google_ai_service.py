@@ -10,6 +10,43 @@ from decouple import config
 
 logger = logging.getLogger(__name__)
 
+# 工作描述解析提示词模板：静态部分约1.5KB，模块加载时构建一次，
+# 每次调用只做{job_text}一处替换
+_JOB_PARSING_TEMPLATE = """
+You are an expert job description parser. Please carefully analyze the following job posting content and extract comprehensive information. Pay special attention to all sections and details.
+
+Job Posting Content:
+{job_text}
+
+Please extract the following information systematically. For each field, provide the most complete and accurate information found in the job posting. If information is not available, mark as "Not Provided":
+
+Job Title: [Extract the job title/position name]
+Job Description: [Extract detailed job description, responsibilities, and duties - be comprehensive]
+Requirements: [Extract all requirements including education, experience, skills, qualifications - be detailed]
+Job Type: [Extract employment type - full-time, part-time, contract, internship, freelance]
+Experience Level: [Extract required experience level - entry, junior, mid, senior, executive]
+Location: [Extract job location/city]
+Remote: [Extract work arrangement - remote, hybrid, on-site]
+Salary Min: [Extract minimum salary if mentioned]
+Salary Max: [Extract maximum salary if mentioned]
+Benefits: [Extract benefits, perks, and compensation details]
+Application Deadline: [Extract application deadline or closing date if mentioned]
+
+IMPORTANT INSTRUCTIONS:
+1. Be thorough - don't miss any information
+2. For multi-line sections like Job Description, Requirements, and Benefits, include all relevant details
+3. Extract exact text where possible, don't paraphrase unless necessary
+4. If salary is mentioned as a range, extract both minimum and maximum values
+5. For job type, use one of: full-time, part-time, contract, internship, freelance
+6. For experience level, use one of: entry, junior, mid, senior, executive
+7. For remote work, use one of: remote, hybrid, on-site
+8. Maintain the exact format shown above with colons after each field name
+9. If a section has multiple points, include them all
+10. Pay special attention to technical skills, qualifications, and specific requirements
+
+Format your response exactly as shown above, with each field on a separate line.
+"""
+
 
 class GoogleAIService:
     """Google AI service for job-student matching and analysis"""
@@ -68,40 +105,7 @@ class GoogleAIService:
 
     def _build_job_parsing_prompt(self, job_text: str) -> str:
         """构建工作描述解析提示词"""
-        return f"""
-You are an expert job description parser. Please carefully analyze the following job posting content and extract comprehensive information. Pay special attention to all sections and details.
-
-Job Posting Content:
-{job_text}
-
-Please extract the following information systematically. For each field, provide the most complete and accurate information found in the job posting. If information is not available, mark as "Not Provided":
-
-Job Title: [Extract the job title/position name]
-Job Description: [Extract detailed job description, responsibilities, and duties - be comprehensive]
-Requirements: [Extract all requirements including education, experience, skills, qualifications - be detailed]
-Job Type: [Extract employment type - full-time, part-time, contract, internship, freelance]
-Experience Level: [Extract required experience level - entry, junior, mid, senior, executive]
-Location: [Extract job location/city]
-Remote: [Extract work arrangement - remote, hybrid, on-site]
-Salary Min: [Extract minimum salary if mentioned]
-Salary Max: [Extract maximum salary if mentioned]
-Benefits: [Extract benefits, perks, and compensation details]
-Application Deadline: [Extract application deadline or closing date if mentioned]
-
-IMPORTANT INSTRUCTIONS:
-1. Be thorough - don't miss any information
-2. For multi-line sections like Job Description, Requirements, and Benefits, include all relevant details
-3. Extract exact text where possible, don't paraphrase unless necessary
-4. If salary is mentioned as a range, extract both minimum and maximum values
-5. For job type, use one of: full-time, part-time, contract, internship, freelance
-6. For experience level, use one of: entry, junior, mid, senior, executive
-7. For remote work, use one of: remote, hybrid, on-site
-8. Maintain the exact format shown above with colons after each field name
-9. If a section has multiple points, include them all
-10. Pay special attention to technical skills, qualifications, and specific requirements
-
-Format your response exactly as shown above, with each field on a separate line.
-"""
+        return _JOB_PARSING_TEMPLATE.format(job_text=job_text)
 
 
 # 全局服务实例
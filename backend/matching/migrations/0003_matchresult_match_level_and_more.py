@@ -0,0 +1,41 @@
+# Generated by Django on 2026-08-31
+
+from django.db import migrations, models
+from django.db.models import Case, CharField, Value, When
+
+
+def backfill_match_level(apps, schema_editor):
+    """按overall_score为存量匹配结果回填等级，单条UPDATE完成"""
+    MatchResult = apps.get_model('matching', 'MatchResult')
+    MatchResult.objects.update(
+        match_level=Case(
+            When(overall_score__gte=90, then=Value('excellent')),
+            When(overall_score__gte=80, then=Value('very_good')),
+            When(overall_score__gte=70, then=Value('good')),
+            When(overall_score__gte=60, then=Value('fair')),
+            default=Value('poor'),
+            output_field=CharField(),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_job_job_cat_active_created_and_more'),
+        ('matching', '0002_initial'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchresult',
+            name='match_level',
+            field=models.CharField(blank=True, help_text='按总分预计算的匹配等级', max_length=16),
+        ),
+        migrations.RunPython(backfill_match_level, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='matchresult',
+            index=models.Index(fields=['match_level', '-overall_score'], name='matching_ma_match_l_4752cd_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django on 2026-08-31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_job_job_cat_active_created_and_more'),
+        ('matching', '0003_matchresult_match_level_and_more'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='matchresult',
+            name='matching_ma_student_b35ae8_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='matchresult',
+            name='matching_ma_job_id_9fb3e7_idx',
+        ),
+        migrations.AddIndex(
+            model_name='matchresult',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['student', '-overall_score'], name='mr_stu_score_active'),
+        ),
+        migrations.AddIndex(
+            model_name='matchresult',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['job', '-overall_score'], name='mr_job_score_active'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 from users.models import StudentProfile
@@ -44,6 +45,14 @@ class MatchResult(models.Model):
     # 改进建议
     improvement_suggestions = models.JSONField(default=list, blank=True)
     
+    # 匹配等级：按overall_score分档预计算入库，统计和筛选可以直接
+    # 走索引分组/过滤，不用把整表分数拉到Python里再分桶
+    match_level = models.CharField(
+        max_length=16,
+        blank=True,
+        help_text="按总分预计算的匹配等级"
+    )
+
     # 匹配状态
     is_active = models.BooleanField(default=True)
     is_viewed_by_student = models.BooleanField(default=False)
@@ -57,28 +66,41 @@ class MatchResult(models.Model):
         unique_together = ['student', 'job']
         ordering = ['-overall_score', '-calculated_at']
         indexes = [
-            models.Index(fields=['student', '-overall_score']),
-            models.Index(fields=['job', '-overall_score']),
+            # 读路径基本都带is_active=True过滤，按活跃行建部分索引：
+            # 体积更小、维护写放大更低，失效行不进索引
+            models.Index(fields=['student', '-overall_score'],
+                         name='mr_stu_score_active',
+                         condition=Q(is_active=True)),
+            models.Index(fields=['job', '-overall_score'],
+                         name='mr_job_score_active',
+                         condition=Q(is_active=True)),
             models.Index(fields=['overall_score']),
+            models.Index(fields=['match_level', '-overall_score']),
         ]
 
     def __str__(self):
         return f"{self.student.user.get_full_name()} -> {self.job.title} ({self.overall_score:.1f}%)"
 
-    @property
-    def match_level(self):
+    @staticmethod
+    def level_for_score(score):
         """根据分数返回匹配等级"""
-        if self.overall_score >= 90:
+        if score >= 90:
             return 'excellent'
-        elif self.overall_score >= 80:
+        elif score >= 80:
             return 'very_good'
-        elif self.overall_score >= 70:
+        elif score >= 70:
             return 'good'
-        elif self.overall_score >= 60:
+        elif score >= 60:
             return 'fair'
         else:
             return 'poor'
 
+    def save(self, *args, **kwargs):
+        # 等级由总分派生，落库前统一刷新；bulk_create不经过save()，
+        # 批量匹配路径在构造行数据时同步赋值
+        self.match_level = self.level_for_score(self.overall_score)
+        super().save(*args, **kwargs)
+
     @property
     def match_level_display(self):
         """匹配等级显示文本"""
@@ -203,11 +225,19 @@ class MatchingJob(models.Model):
     def __str__(self):
         return f"{self.name} - {self.get_status_display()}"
 
+    # 状态流转只改涉及的列：无update_fields的save()会整行重写，
+    # 长任务频繁更新进度时把description等大字段也反复写一遍
+
     def start_execution(self):
         """开始执行匹配任务"""
         self.status = 'running'
         self.started_at = timezone.now()
-        self.save()
+        self.save(update_fields=['status', 'started_at'])
+
+    def update_progress(self, progress_percentage):
+        """更新任务进度（只写进度列，适合批内高频调用）"""
+        self.progress_percentage = progress_percentage
+        self.save(update_fields=['progress_percentage'])
 
     def complete_execution(self, total_matches=0, execution_time=None):
         """完成匹配任务"""
@@ -215,16 +245,21 @@ class MatchingJob(models.Model):
         self.completed_at = timezone.now()
         self.progress_percentage = 100
         self.total_matches_found = total_matches
+        update_fields = [
+            'status', 'completed_at', 'progress_percentage',
+            'total_matches_found',
+        ]
         if execution_time:
             self.execution_time_seconds = execution_time
-        self.save()
+            update_fields.append('execution_time_seconds')
+        self.save(update_fields=update_fields)
 
     def fail_execution(self, error_message):
         """标记任务失败"""
         self.status = 'failed'
         self.completed_at = timezone.now()
         self.error_message = error_message
-        self.save()
+        self.save(update_fields=['status', 'completed_at', 'error_message'])
 
 
 class StudentRecommendation(models.Model):
@@ -106,8 +106,8 @@ class RecommendationItemSerializer(serializers.ModelSerializer):
 class StudentRecommendationSerializer(serializers.ModelSerializer):
     """学生推荐序列化器"""
     student_name = serializers.CharField(source='student.user.get_full_name', read_only=True)
-    items = RecommendationItemSerializer(many=True, read_only=True)
-    
+    items = serializers.SerializerMethodField()
+
     class Meta:
         model = StudentRecommendation
         fields = [
@@ -116,6 +116,13 @@ class StudentRecommendationSerializer(serializers.ModelSerializer):
             'is_active', 'expires_at', 'created_at', 'updated_at'
         ]
 
+    def get_items(self, obj):
+        """优先使用视图预取到prefetched_items的推荐项，避免逐条补查"""
+        items = getattr(obj, 'prefetched_items', None)
+        if items is None:
+            items = obj.recommendationitem_set.all()
+        return RecommendationItemSerializer(items, many=True).data
+
 
 class StudentRecommendationCreateSerializer(serializers.ModelSerializer):
     """学生推荐创建序列化器"""
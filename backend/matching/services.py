@@ -13,7 +13,10 @@ import logging
 from users.models import StudentProfile, User
 from jobs.models import Job
 from applications.models import Application
-from .models import MatchResult, MatchingJob, StudentRecommendation, RecommendationItem
+from .models import (
+    MatchResult, SkillMatchDetail, MatchingJob,
+    StudentRecommendation, RecommendationItem
+)
 from .algorithms import IntelligentMatcher
 
 logger = logging.getLogger(__name__)
@@ -158,16 +161,17 @@ class MatchingService:
                     'recommendation_reason': ', '.join(match.recommendation_reasons[:2])
                 })
             
-            # 技能推荐（基于缺失的关键技能）
+            # 技能推荐（基于缺失的关键技能）：缺失明细在
+            # SkillMatchDetail表里，一条查询取齐所有匹配的缺口
             skill_gaps = {}
-            for match in matches:
-                for missing_skill in match.match_details.get('missing_skills', []):
-                    skill_name = missing_skill['skill_name']
-                    importance = missing_skill['importance']
-                    
-                    if skill_name not in skill_gaps:
-                        skill_gaps[skill_name] = {'count': 0, 'importance': importance}
-                    skill_gaps[skill_name]['count'] += 1
+            missing_rows = SkillMatchDetail.objects.filter(
+                match_result__in=matches,
+                is_missing_skill=True
+            ).values_list('skill_name', 'job_skill_importance')
+            for skill_name, importance in missing_rows:
+                if skill_name not in skill_gaps:
+                    skill_gaps[skill_name] = {'count': 0, 'importance': importance}
+                skill_gaps[skill_name]['count'] += 1
             
             # 按出现频率和重要性排序
             sorted_skills = sorted(
@@ -336,14 +340,18 @@ class MatchingService:
 
 
 # Celery异步任务
-@shared_task
-def batch_calculate_matches(student_ids: List[int] = None, job_ids: List[int] = None, 
+# 批量匹配默认走独立的matching_batch队列，worker按队列起
+# （celery -A ... worker -Q matching_batch），重型批任务不挤占
+# 交互请求的队列；acks_late配合重试，worker中途被杀任务可重投
+@shared_task(queue='matching_batch', acks_late=True, max_retries=3)
+def batch_calculate_matches(student_ids: List[int] = None, job_ids: List[int] = None,
                            min_score: float = 60.0):
     """批量计算匹配结果的异步任务"""
     try:
         matcher = IntelligentMatcher()
         
-        # 获取学生和职位
+        # 获取学生和职位；技能关联预取好，匹配器读取.all()时
+        # 直接命中缓存，不再逐个实例回表
         if student_ids:
             students = StudentProfile.objects.filter(id__in=student_ids).select_related('user')
         else:
@@ -351,7 +359,8 @@ def batch_calculate_matches(student_ids: List[int] = None, job_ids: List[int] =
                 user__is_active=True,
                 is_seeking_job=True
             ).select_related('user')
-        
+        students = students.prefetch_related('studentskill_set__skill')
+
         if job_ids:
             jobs = Job.objects.filter(id__in=job_ids).select_related('employer')
         else:
@@ -359,6 +368,10 @@ def batch_calculate_matches(student_ids: List[int] = None, job_ids: List[int] =
                 is_active=True,
                 application_deadline__gte=timezone.now().date()
             ).select_related('employer')
+        jobs = jobs.prefetch_related(
+            'jobskillrequirement_set__skill',
+            'jobskillpreference_set__skill'
+        )
         
         # 批量匹配
         results = matcher.batch_match(list(students), list(jobs), min_score)
@@ -0,0 +1,22 @@
+"""
+匹配模块信号处理：算法配置变更时让各级缓存失效
+"""
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import MatchingAlgorithmConfig
+
+
+@receiver(post_save, sender=MatchingAlgorithmConfig)
+@receiver(post_delete, sender=MatchingAlgorithmConfig)
+def invalidate_algorithm_config_cache(sender, instance, **kwargs):
+    """配置保存/删除后清掉版本键和本进程的LRU缓存
+
+    其他进程没有信号可收，靠版本键的60秒TTL过期后换到新版本。
+    """
+    from . import algorithms
+
+    cache.delete(algorithms.ALGORITHM_CONFIG_VERSION_KEY % instance.pk)
+    algorithms._load_config.cache_clear()
+    algorithms._get_cached_default_config.cache_clear()
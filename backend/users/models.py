@@ -1,3 +1,5 @@
+from functools import cached_property
+
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.core.validators import MinLengthValidator, MaxLengthValidator
@@ -24,6 +26,16 @@ class User(AbstractUser):
     def __str__(self):
         return f"{self.username} ({self.get_user_type_display()})"
 
+    @cached_property
+    def employer_profile_cached(self):
+        """雇主档案，按用户实例缓存；不存在时返回None而不是抛异常"""
+        return EmployerProfile.objects.filter(user=self).first()
+
+    @cached_property
+    def student_profile_cached(self):
+        """学生档案，按用户实例缓存；不存在时返回None而不是抛异常"""
+        return StudentProfile.objects.filter(user=self).first()
+
 
 class Skill(models.Model):
     """技能标签模型"""